@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import os
 from collections import UserDict
+from functools import lru_cache
 from typing import Any, NoReturn, Optional
 
 import fsspec
@@ -25,34 +26,40 @@ def set_default_config(protocol: str, config: dict[str, Any]):
     fsql_config[protocol] = config
 
 
+# boto itself supports only access key and secret key via env
+_S3_ENV_KEYS_L1 = {
+    "AWS_ACCESS_KEY_ID": "key",
+    "AWS_SECRET_ACCESS_KEY": "secret",
+    "AWS_SESSION_TOKEN": "token",
+}
+_S3_ENV_KEYS_L2 = {
+    "AWS_ENDPOINT_URL": "endpoint_url",
+    "AWS_REGION_NAME": "region_name",
+}
+
+
+def _env2dict(mapping: dict[str, str]) -> dict[str, Any]:
+    env = os.environ
+    return {val: env[key] for key, val in mapping.items() if key in env}
+
+
 def _get_default_config(protocol: str) -> dict[str, Any]:
     """Reads environment variables and merges with default config. Default config has precedence.
 
     In particular, we need it to allow minio-in-place-of-s3 functionality, which is not supported on its
     own using environment variables in vanilla fsspec."""
-    env2dict = lambda mapping: {val: os.environ[key] for key, val in mapping.items() if key in os.environ}  # noqa: E731
     if protocol == "s3":
-        # boto itself supports only access key and secret key via env
         # TODO this is quite dumb, especially the max pool connections -- a more intelligent way of config is desired
         # the right way forward is probably some FsFactory singleton which reads:
         # - env variables in case where it makes sense (AWS ids)
         # - config files with rich options that allow generic passthrough
         # - defaults as in the case of max_pool_connections
         # note the programmatic override can already be done by passing Fs instance to api methods
-        configurable_keys_l1 = {
-            "AWS_ACCESS_KEY_ID": "key",
-            "AWS_SECRET_ACCESS_KEY": "secret",
-            "AWS_SESSION_TOKEN": "token",
-        }
-        config: dict[str, Any] = env2dict(configurable_keys_l1)  # mypy
-        configurable_keys_l2 = {
-            "AWS_ENDPOINT_URL": "endpoint_url",
-            "AWS_REGION_NAME": "region_name",
-        }
-        l2kwargs = env2dict(configurable_keys_l2)
+        config = _env2dict(_S3_ENV_KEYS_L1)
         # in case of a lot of small files and local tests, we tend to exhaust the conn pool quickly and spawning warns
-        config["config_kwargs"] = {"max_pool_connections": 25}
-        config["client_kwargs"] = l2kwargs
+        # botocore does not grow the pool on its own, so we leave headroom above the default read concurrency
+        config["config_kwargs"] = {"max_pool_connections": 128}
+        config["client_kwargs"] = _env2dict(_S3_ENV_KEYS_L2)
     else:
         config = {}
     return {**config, **fsql_config.get(protocol, {})}
@@ -73,6 +80,22 @@ def get_url_and_fs(url: str) -> tuple[str, AbstractFileSystem]:
     return url_suff, get_fs(protocol)
 
 
+@lru_cache(maxsize=int(os.environ.get("FSQL_METADATA_CACHE_SIZE", "0")))
+def ls_cached(fs: AbstractFileSystem, url: str) -> list[dict[str, Any]]:
+    """Detailed `ls` of the `url`, memoized across calls in a process-global LRU keyed by `(fs, url)`.
+
+    The cache is disabled by default, as it breaks the expectation that every query sees the current state of
+    the filesystem. To enable, set the env variable `FSQL_METADATA_CACHE_SIZE` to the number of listings to keep
+    (must be done before `fsql` is imported), and call `invalidate_metadata_cache` whenever the underlying
+    data changes. Useful mostly for repeated queries against the same static table on a remote filesystem."""
+    return fs.ls(url, detail=True)
+
+
+def invalidate_metadata_cache() -> None:
+    """Drops all listings memoized by `ls_cached`."""
+    ls_cached.cache_clear()
+
+
 def assert_exhaustive_enum(x: NoReturn) -> NoReturn:
     """Python does not sux! Call this function at the end of if-else matching of Enum, to have mypy
     ensure for you that all values are considered! Cf https://tech.preferred.jp/en/blog/python-exhaustive-union-match/
@@ -41,6 +41,7 @@ import io
 import logging
 import shutil
 import warnings
+from concurrent.futures import Executor, ThreadPoolExecutor
 from typing import Optional, Union
 
 import pandas as pd
@@ -48,13 +49,24 @@ from fsspec.spec import AbstractFileSystem
 
 from fsql import get_url_and_fs
 from fsql.column_parser import AUTO_PARSER, ColumnParser
-from fsql.deser import PANDAS_READER, DataObject, DataObjectRich, DataReader
+from fsql.deser import (
+    _INLINE_EXECUTOR,
+    PANDAS_READER,
+    DataObject,
+    DataObjectRich,
+    DataReader,
+    _in_shared_pool_worker,
+    _shared_thread_pool,
+)
 from fsql.partition import Partition
 from fsql.partition_discovery import discover_partitions
 from fsql.query import Query
 
 logger = logging.getLogger(__name__)
 
+# shared by all the calls, like the download pool in `deser` -- only an explicit `concurrency` gets a dedicated one
+_DISCOVERY_POOL = _shared_thread_pool(32, "fsql-discovery")
+
 
 def read_s3_table(
     url: str,
@@ -73,6 +85,7 @@ def read_partitioned_table(
     column_parser: ColumnParser = AUTO_PARSER,
     data_reader: DataReader[DataObject] = PANDAS_READER,  # type: ignore
     fs: Optional[AbstractFileSystem] = None,
+    concurrency: Optional[int] = None,
 ) -> Union[DataObject, DataObjectRich]:
     """Reads a table rooted at `url`, with partition columns described in `column_parser` and filtered via `query`.
 
@@ -81,6 +94,11 @@ def read_partitioned_table(
     `query` module.
 
     Note that the provided DataReaders launch a ThreadPoolExecutor when downloading individual files, to speed up I/O.
+    Similarly, partition discovery lists sibling directories concurrently in a ThreadPoolExecutor. The downloads use
+    a process-wide pool (see `DataReader.read_and_concat`), the discovery a process-wide pool of 32 threads --
+    `concurrency`, if provided, sizes dedicated pools for both instead. When raising it for a default s3 `fs`, mind
+    the `max_pool_connections` in its config. The downloads start as soon as the first partitions are discovered,
+    not after the discovery has finished.
 
     If `fs` is not provided, a default one is constructed from the url. The instance is then used for all `ls`
     and `open` operations.
@@ -92,19 +110,35 @@ def read_partitioned_table(
     """
     url_suff, fs_default = get_url_and_fs(url)
     fs = fs if fs else fs_default
-    # we are relying on the invariant that directory urls end with '/'
-    # we thus need to check whether the user is not fooling us
+    # we are relying on the invariant that directory urls end with '/' -- and the table root is always a directory
     if not url_suff.endswith("/"):
-        if fs.isdir(url_suff):
-            url_suff += "/"
+        url_suff += "/"
 
+    # eg the cheap conjuncts first, so that they short-circuit the expensive ones for every partition
+    query = query.optimize()
     root_partition = Partition(url_suff, {})
     logging.debug(f"partition discovery starting. Url: {url_suff}, Query: {query}")
-    partitions = discover_partitions(query, column_parser, root_partition, fs)
-    partitions = list(partitions)
-    logging.debug(f"partitions are {partitions}")
-    logging.debug(f"data fetch starting. Url: {url}, Query: {query}")
-    return data_reader.read_and_concat(partitions, fs)
+    if concurrency is None:
+        # a nested call, eg from within a reader, lists sequentially instead -- see `_in_shared_pool_worker`
+        executor = _INLINE_EXECUTOR if _in_shared_pool_worker() else _DISCOVERY_POOL
+        return _discover_and_read(query, column_parser, root_partition, fs, data_reader, executor, None)
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return _discover_and_read(query, column_parser, root_partition, fs, data_reader, executor, concurrency)
+
+
+def _discover_and_read(
+    query: Query,
+    column_parser: ColumnParser,
+    root_partition: Partition,
+    fs: AbstractFileSystem,
+    data_reader: DataReader[DataObject],
+    executor: Executor,
+    concurrency: Optional[int],
+) -> Union[DataObject, DataObjectRich]:
+    partitions = discover_partitions(query, column_parser, root_partition, fs, executor)
+    # not materialised -- the reader submits the reads as the partitions are being discovered
+    logging.debug(f"data fetch starting. Url: {root_partition.url}, Query: {query}")
+    return data_reader.read_and_concat(partitions, fs, max_workers=concurrency)
 
 
 def write_object(
@@ -117,12 +151,14 @@ def write_object(
     """Minimalistic function to write an object to a designated location.
 
     * Does not support any table-like semantics -- partition appends or multi-partition inserts,
-    * for `io` objects, `seek(0)` and `shutil` write is the behaviour; `format` argument must not be specified,
+    * for `io` objects, the whole content is written regardless of the current position; `format` argument must not
+      be specified,
     * for Data Frames converts to the specified format (only parquet+fastparquet for now), and then it is written
       using the file-like object from fsspec and dataframe's native write.
 
     At the moment, only parquet and csv as a format are supported. The only format options are 'engine' with values
-    'fastparquet' and 'pyarrow' (these refer only to parquet format).
+    'fastparquet' and 'pyarrow', and 'compression' with any codec the engine supports, defaulting to 'snappy' (these
+    refer only to parquet format). For upload-bound writes, 'zstd' typically yields considerably smaller objects.
 
     For larger data frames or table-like semantics, use rather endpoint (TODO).
 
@@ -137,11 +173,16 @@ def write_object(
     if isinstance(data, pd.DataFrame):
         if format == "parquet" or format is None:
             engine = format_options.get("engine", "fastparquet")
+            compression = format_options.get("compression", "snappy")
             if engine == "fastparquet":
-                data.to_parquet(url_suff, engine=engine, open_with=fs.open)
+                # serialised in memory first, so that the upload is a single contiguous write instead of many small
+                buf = io.BytesIO()
+                data.to_parquet(buf, engine=engine, compression=compression)
+                with fs.open(url_suff, "wb") as fd:
+                    fd.write(buf.getbuffer())
             elif engine == "pyarrow":
                 with fs.open(url_suff, "wb") as fd:
-                    data.to_parquet(fd, engine=engine)
+                    data.to_parquet(fd, engine=engine, compression=compression)
             else:
                 raise ValueError(f"unsupported engine for dataframe writing: {engine}")
         elif format == "csv":
@@ -155,9 +196,12 @@ def write_object(
     elif isinstance(data, io.StringIO) or isinstance(data, io.BytesIO):
         if format:
             raise ValueError(f"cannot specify format when data is a buffer. Provided format: {format}")
-        data.seek(0)
-        mode = "wb" if isinstance(data, io.BytesIO) else "w"
-        with fs.open(url_suff, mode) as fd:
-            shutil.copyfileobj(data, fd)
+        if isinstance(data, io.BytesIO):
+            # the whole buffer in one call -- eg a single PutObject on s3 instead of a buffered multi-write
+            fs.pipe_file(url_suff, data.getvalue())
+        else:
+            data.seek(0)
+            with fs.open(url_suff, "w") as fd:
+                shutil.copyfileobj(data, fd)
     else:
         raise ValueError(f"cannot infer writer for object of type {type(data)}")
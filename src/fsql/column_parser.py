@@ -29,22 +29,35 @@ FixedColumns parser using the `from_str` methods -- see their individual documen
 from __future__ import annotations
 
 import logging
+import re
+import sys
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Sequence
 
 from fsql.partition import Partition
+from fsql.query import Query
 
 logger = logging.getLogger(__name__)
 
+# single partition in `from_str`: name, optionally followed by either =[v1,v2,...] or =v
+_GRAMMAR_RE = re.compile(r"([^=\[\]]+)(?:=\[([^\]]*)\]|=([^\[\]]+))?")
 
-@dataclass
+
+@dataclass(frozen=True)
 class PartitionGrammar:  # this is a quite bad name
+    __slots__ = ("name", "values")
     name: str
     values: Optional[list[str]]
 
+    def __reduce__(self):
+        # see Partition
+        return (PartitionGrammar, (self.name, self.values))
+
 
 class ColumnParser(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def __call__(self, dirname: str) -> tuple[str, str]:
         raise NotImplementedError("abc")
@@ -65,39 +78,73 @@ class ColumnParser(ABC):
     def is_terminal_level(self) -> bool:
         raise NotImplementedError("abc")
 
+    def generate_from_query(self, query: Query) -> Optional[list[str]]:
+        """Like `generate`, but with the values prescribed by the `query` instead (see `Query.generate`). Those
+        are not guaranteed to exist, unlike the values prescribed by the user to the parser itself."""
+        return None
+
+    def known_depth(self, query: Optional[Query] = None) -> Optional[int]:
+        """Number of path segments (the filename included) under the current level, if it is fixed and no values
+        are prescribed at any of them -- neither by the grammar, nor by the `query` (see `Query.generate`). In that
+        case, the whole subtree is to be listed anyway, and partition discovery thus does it in bulk instead of
+        directory by directory. None otherwise."""
+        return None
+
     @classmethod
     def from_str(cls, path_description: str):
         """Example: col1/col2=v1/col3=[v4,v5,v6]/colFname"""
-        # NOTE this whole method better be replaced with a proper parser
+
         def process_single_partition(partition_desc: str):
-            eq_split = partition_desc.split("=")
-            if len(eq_split) == 1:
-                return PartitionGrammar(eq_split[0], None)
+            match = _GRAMMAR_RE.fullmatch(partition_desc)
+            if not match:
+                raise ValueError(f"invalid partition description {partition_desc} in {path_description}")
+            name, value_list, value = match.groups()
+            if value_list is not None:
+                return PartitionGrammar(name, value_list.split(","))
+            elif value is not None:
+                return PartitionGrammar(name, [value])
             else:
-                if eq_split[1][0] == "[":
-                    return PartitionGrammar(eq_split[0], eq_split[1][1:-1].split(","))
-                else:
-                    return PartitionGrammar(eq_split[0], [eq_split[1]])
+                return PartitionGrammar(name, None)
 
         # not sure how to correctly handle this -- I don't want to declare the __init__ here abstract...
         return cls([process_single_partition(e) for e in path_description.split("/")])  # type: ignore
 
 
+def _is_prescribed(partition: PartitionGrammar, query: Optional[Query]) -> bool:
+    return bool(partition.values) or (query is not None and query.generate(partition.name) is not None)
+
+
 class AutoParser(ColumnParser):
-    def __init__(self, partition_grammars: Optional[list[PartitionGrammar]] = None):
-        self.partitions = partition_grammars
+    __slots__ = ("_grammars", "_cursor", "_tail")
+
+    def __init__(self, partition_grammars: Optional[Sequence[PartitionGrammar]] = None, cursor: int = 0):
+        # the grammars are shared by the whole chain of tails, each of which just advances the cursor
+        self._grammars = tuple(partition_grammars or ())
+        self._cursor = cursor
+        # the whole chain of tails is created upfront, so that the discovery does not instantiate per directory
+        remaining = self._remaining()
+        if remaining > 1:
+            self._tail: AutoParser = AutoParser(self._grammars, cursor + 1)
+        else:
+            # all exhausted parsers are equivalent to the grammar-less one, so the singleton is shared
+            self._tail = AUTO_PARSER if remaining == 1 else self
+
+    @property
+    def partitions(self) -> list[PartitionGrammar]:
+        return list(self._grammars[self._cursor :])
+
+    def _remaining(self) -> int:
+        return len(self._grammars) - self._cursor
 
     def __call__(self, dirname: str) -> tuple[str, str]:
-        key, value = dirname.strip("/").split("=", 1)
-        return key, value  # we don't return directly due to mypy not understanding split(_, 1)
+        key, sep, value = dirname.strip("/").partition("=")
+        if not sep:
+            raise ValueError(f"directory {dirname} is not of the `key=value` form")
+        # interned, as the same few names and values repeat in the columns of every partition of the table
+        return sys.intern(key), sys.intern(value)
 
     def tail(self, partition: Partition) -> ColumnParser:
-        if not self.partitions:
-            return self
-        else:
-            # TODO performance issue
-            # ideally, the pop call would return an existing instance, which would be pre-created...
-            return AutoParser(self.partitions[1:])
+        return self._tail
 
     def parses_filenames(self) -> bool:
         return False
@@ -108,43 +155,84 @@ class AutoParser(ColumnParser):
         # first iterating through all of the discovered partitions and filtering for max length only.
         # In the same vein, we don't guarantee even that the columns are the same for every partition.
         # For that, however, the best we could do is crash in case of inconsistency...
-        if not self.partitions:
-            return True
-        else:
-            return len(self.partitions) == 0
+        return self._remaining() == 0
 
     def generate(self) -> Optional[list[str]]:
-        if self.partitions and self.partitions[0].values:
-            return [f"{self.partitions[0].name}={value}" for value in self.partitions[0].values]
+        current = self._grammars[self._cursor] if self._remaining() else None
+        if current and current.values:
+            return [f"{current.name}={value}" for value in current.values]
         else:
             return None
 
+    def generate_from_query(self, query: Query) -> Optional[list[str]]:
+        if not self._remaining():
+            return None
+        name = self._grammars[self._cursor].name
+        values = query.generate(name)
+        if values is None:
+            return None
+        return [f"{name}={value}" for value in sorted(set(map(str, values)))]
+
+    def known_depth(self, query: Optional[Query] = None) -> Optional[int]:
+        remaining = self._grammars[self._cursor :]
+        if not remaining or any(_is_prescribed(partition, query) for partition in remaining):
+            return None
+        else:
+            return len(remaining) + 1
+
 
 class FixedColumnsParser(ColumnParser):
-    def __init__(self, partition_grammars: list[PartitionGrammar]):
-        self.partitions = partition_grammars
+    __slots__ = ("_grammars", "_cursor", "_tail")
+
+    def __init__(self, partition_grammars: Sequence[PartitionGrammar], cursor: int = 0):
+        # see AutoParser
+        self._grammars = tuple(partition_grammars)
+        self._cursor = cursor
+        remaining = len(self._grammars) - cursor
+        if remaining > 1:
+            self._tail: FixedColumnsParser = FixedColumnsParser(self._grammars, cursor + 1)
+        else:
+            self._tail = _EXHAUSTED_FIXED_PARSER if remaining == 1 else self
+
+    @property
+    def partitions(self) -> list[PartitionGrammar]:
+        return list(self._grammars[self._cursor :])
 
     def __call__(self, dirname: str) -> tuple[str, str]:
-        return (self.partitions[0].name, dirname.strip("/"))
+        value = dirname.strip("/")
+        # the filenames are unique, thus not worth interning, unlike the directory values -- see AutoParser
+        return (self._grammars[self._cursor].name, value if self.is_terminal_level() else sys.intern(value))
 
     def tail(self, partition: Partition) -> ColumnParser:
-        # TODO performance issue
-        # ideally, the pop call would return an existing instance, which would be pre-created...
-        return FixedColumnsParser(self.partitions[1:])
+        return self._tail
 
     def parses_filenames(self) -> bool:
         return True
 
     def is_terminal_level(self) -> bool:
-        return len(self.partitions) == 1
+        return len(self._grammars) - self._cursor == 1
 
     def generate(self) -> Optional[list[str]]:
-        if not self.partitions:
+        if self._cursor >= len(self._grammars):
             raise ValueError("no partitions remaining")
-        if self.partitions[0].values:
-            return self.partitions[0].values
+        if self._grammars[self._cursor].values:
+            return self._grammars[self._cursor].values
         else:
             return None
 
+    def generate_from_query(self, query: Query) -> Optional[list[str]]:
+        if self._cursor >= len(self._grammars):
+            return None
+        values = query.generate(self._grammars[self._cursor].name)
+        return None if values is None else sorted(set(map(str, values)))
+
+    def known_depth(self, query: Optional[Query] = None) -> Optional[int]:
+        remaining = self._grammars[self._cursor :]
+        if not remaining or any(_is_prescribed(partition, query) for partition in remaining):
+            return None
+        else:
+            return len(remaining)
+
 
 AUTO_PARSER = AutoParser()
+_EXHAUSTED_FIXED_PARSER = FixedColumnsParser(())
@@ -14,7 +14,8 @@ import calendar
 import datetime
 import logging
 from enum import Enum, auto, unique
-from typing import Optional, Union
+from functools import lru_cache
+from typing import Optional, Tuple, Union
 
 from fsql import assert_exhaustive_enum
 from fsql.column_parser import ColumnParser
@@ -31,6 +32,18 @@ def _date_parser(date_spec: Union[str, datetime.date]) -> datetime.date:
         return datetime.datetime.strptime(date_spec, "%Y/%m/%d").date()
 
 
+Ymd = Tuple[int, int, int]
+
+
+def _to_ymd(date: Union[datetime.date, Ymd]) -> Ymd:
+    return (date.year, date.month, date.day) if isinstance(date, datetime.date) else date
+
+
+@lru_cache(maxsize=4096)
+def _last_day(year: int, month: int) -> int:
+    return calendar.monthrange(year, month)[1]
+
+
 class DateRangeQuery(Query):
     """Allows for selection ymd-partitions that fall into a given range."""
 
@@ -48,15 +61,21 @@ class DateRangeQuery(Query):
         self.map = {"year": year_name, "month": month_name, "day": day_name}
         self.start = _date_parser(start)
         self.end = _date_parser(end)
+        # partitions are compared as ordinals, to spare strptime and date comparisons per partition
+        self._start_ord = self.start.toordinal()
+        self._end_ord = self.end.toordinal()
+        self._columns = frozenset(self.map.values())
+
+    def cost_hint(self) -> int:
+        return 2
 
     def eval_all(self, columns: dict[str, str]) -> bool:
-        if not set(self.map.values()).issubset(columns.keys()):
+        if not self._columns <= columns.keys():
             rv = False
         else:
-            extractor = lambda s: columns[self.map[s]]  # noqa: E731
-            extracted = f"{extractor('year')}/{extractor('month')}/{extractor('day')}"
-            partition_value = _date_parser(extracted)
-            rv = partition_value >= self.start and partition_value < self.end
+            year, month, day = (int(columns[self.map[s]]) for s in ("year", "month", "day"))
+            partition_ord = datetime.date(year, month, day).toordinal()
+            rv = self._start_ord <= partition_ord < self._end_ord
         logger.debug(f"invoked daterange-all with {columns}, resulted to {rv}")
         return rv
 
@@ -68,16 +87,23 @@ class DateRangeQuery(Query):
             rv = True
         else:
             year = int(columns[self.map["year"]])
-            month_l = int(columns.get(self.map["month"], "1"))
-            month_r = int(columns.get(self.map["month"], "12"))
-            day_l = int(columns.get(self.map["day"], "1"))
-            day_r = int(columns.get(self.map["day"], str(calendar.monthrange(year, month_r)[1])))
-            date_l = datetime.date(year, month_l, day_l)
-            date_r = datetime.date(year, month_r, day_r)
-            rv = date_l < self.end and date_r >= self.start
+            month = columns.get(self.map["month"])
+            month_l, month_r = (int(month), int(month)) if month is not None else (1, 12)
+            day = columns.get(self.map["day"])
+            day_l, day_r = (int(day), int(day)) if day is not None else (1, _last_day(year, month_r))
+            ord_l = datetime.date(year, month_l, day_l).toordinal()
+            ord_r = datetime.date(year, month_r, day_r).toordinal()
+            rv = ord_l < self._end_ord and ord_r >= self._start_ord
         logger.debug(f"invoked daterange-available with {columns}, resulted to {rv}")
         return rv
 
+    def generate(self, column: str) -> Optional[list[str]]:
+        # months and days may be zero-padded on the path, so we prescribe just the years
+        if column != self.map["year"]:
+            return None
+        last = self.end - datetime.timedelta(1)
+        return [str(year) for year in range(self.start.year, last.year + 1)]
+
 
 @unique
 class DRLevel(Enum):
@@ -94,17 +120,28 @@ class DateRangeGenerator(ColumnParser):
 
     def __init__(
         self,
-        start: datetime.date,
-        end: datetime.date,
+        start: Union[datetime.date, Ymd],
+        end: Union[datetime.date, Ymd],
         level: DRLevel,
         map: dict[DRLevel, str],
         include_column_in_path: bool,
     ):
-        self.start = start
-        self.end = end
+        # internally, the bounds are (y, m, d) tuples -- those compare the same as dates, but don't need validation
+        self._start = _to_ymd(start)
+        self._end = _to_ymd(end)
         self.level = level
         self.map = map
         self.include_column_in_path = include_column_in_path
+        # tails are memoized, since eg all files of a single day share the same one
+        self._tails: dict[tuple[Ymd, Ymd, DRLevel], DateRangeGenerator] = {}
+
+    @property
+    def start(self) -> datetime.date:
+        return datetime.date(*self._start)
+
+    @property
+    def end(self) -> datetime.date:
+        return datetime.date(*self._end)
 
     def __call__(self, dirname: str) -> tuple[str, str]:
         if self.include_column_in_path:
@@ -116,24 +153,27 @@ class DateRangeGenerator(ColumnParser):
 
     def tail(self, partition: Partition) -> ColumnParser:
         # this is heavy metal -- we need to restrict the start/end range to those valid for the current partition
+        # the range is clamped to the year/month of the partition
         year = int(partition.columns[self.map[DRLevel.Y]])
         if self.level is DRLevel.Y:
-            start = self.start if year == self.start.year else datetime.date(year, 1, 1)
-            end = self.end if year == self.end.year else datetime.date(year, 12, 31)
+            start = max(self._start, (year, 1, 1))
+            end = min(self._end, (year, 12, 31))
             next_level = DRLevel.M
         elif self.level is DRLevel.M:
             month = int(partition.columns[self.map[DRLevel.M]])
-            start = self.start if month == self.start.month else datetime.date(year, month, 1)
-            month_range = calendar.monthrange(year, month)[1]
-            end = self.end if month == self.end.month else datetime.date(year, month, month_range)
+            start = max(self._start, (year, month, 1))
+            end = min(self._end, (year, month, _last_day(year, month)))
             next_level = DRLevel.D
         elif self.level is DRLevel.D:
-            start = self.start
-            end = self.end
+            start = self._start
+            end = self._end
             next_level = DRLevel.F
         else:
             raise ValueError("unexpected call of tail -- internal failure to terminate discovery")
-        return DateRangeGenerator(start, end, next_level, self.map, self.include_column_in_path)
+        key = (start, end, next_level)
+        if key not in self._tails:
+            self._tails[key] = DateRangeGenerator(start, end, next_level, self.map, self.include_column_in_path)
+        return self._tails[key]
 
     def parses_filenames(self) -> bool:
         return False
@@ -144,11 +184,11 @@ class DateRangeGenerator(ColumnParser):
     def generate(self) -> Optional[list[str]]:
         # we add the +1 because we need inclusive ranges
         if self.level is DRLevel.Y:
-            int_range = range(self.start.year, self.end.year + 1)
+            int_range = range(self._start[0], self._end[0] + 1)
         elif self.level is DRLevel.M:
-            int_range = range(self.start.month, self.end.month + 1)
+            int_range = range(self._start[1], self._end[1] + 1)
         elif self.level is DRLevel.D:
-            int_range = range(self.start.day, self.end.day + 1)
+            int_range = range(self._start[2], self._end[2] + 1)
         elif self.level is DRLevel.F:
             return None
         else:
@@ -4,6 +4,7 @@ The main interface `DataReader` with entrypoint method `read_and_concat` gives t
 the operation.  There are the following default instances:
  - PandasReader, which parses to pandas data frames and adds the partition columns as df column,
    and concatenates all the individual sub-frames into a single one
+ - ArrowTableReader, a PandasReader variant which returns a pyarrow Table, concatenated without copying
  - EnumeratedDictReader, which reads the data as a dictionary, adds the partition columns as dict
    keys, and concatenates into an enumerated dict (order being the alphabetic of underlying files)
  - IdentityReader, which returns a list of all matching underlying files, along with the dictionary
@@ -35,7 +36,7 @@ return an object such as (lazy) data frame as early as possible, and apply any t
 # - we are using typing.Tuple instead of tuple for types because of the type alias declarations. Fix with python 3.9
 # - the Generics are not done properly -- see the comments at `DataReader.read_and_concat` and `PartitionReadOutcome`
 # - there is some overlap between `PandasReader.read_single` and `EnumeratedDictReader.read_single`, notably in the
-#   nested function `_read_internal`. It may be a better idea to, instead of `read_single`, implement `read_partition`,
+#   `_read_partition` methods. It may be a better idea to, instead of `read_single`, implement `read_partition`,
 #   `error_list`, `extend_data_object_with_partition_columns`, and keep the `read_single` skeleton in the DataReader.
 #   Only time will tell.
 # - see the InputFormat -- it can be addressed with the previous comment, separating the Auto from the rest and adding
@@ -45,15 +46,20 @@ from __future__ import annotations
 
 import json
 import logging
+import multiprocessing
+import os
+import threading
+import time
 from abc import abstractmethod
 from collections import defaultdict
 from collections.abc import Callable
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
 from enum import Enum, auto, unique
-from functools import partial, reduce
-from itertools import chain
-from typing import Any, Generic, Iterable, Tuple, TypeVar, Union
+from functools import lru_cache, partial
+from itertools import chain, groupby
+from typing import Any, Generic, Iterable, Literal, Optional, Tuple, TypeVar, Union
+from weakref import WeakKeyDictionary
 
 import pandas as pd
 from fsspec.core import OpenFile
@@ -64,16 +70,6 @@ from fsql.partition import Partition
 
 logger = logging.getLogger(__name__)
 
-A = TypeVar("A")
-B = TypeVar("B")
-BiIterator = Tuple[Iterable[A], Iterable[B]]
-
-
-# lambda acc, e: (chain(acc[0], e[0]), chain(acc[1], e[1])) # not sufficient for mypy
-def flatten_biiterator(acc: BiIterator, elem: BiIterator) -> BiIterator:
-    """When used with `reduce`, converts an iterable of tuple(iterable, iterable) to a tuple(iterable, iterable)"""
-    return (chain(acc[0], elem[0]), chain(acc[1], elem[1]))
-
 
 @unique
 class InputFormat(Enum):
@@ -87,12 +83,16 @@ class InputFormat(Enum):
 
     @classmethod
     def from_url(cls, url: str):
-        return {
-            "json": InputFormat.JSON,
-            "parquet": InputFormat.PARQUET,
-            "csv": InputFormat.CSV,
-            "xlsx": InputFormat.XLSX,
-        }[url]
+        return _SUFFIX_TO_INPUT_FORMAT[url]
+
+
+# outside of the enum, as it would otherwise become its member
+_SUFFIX_TO_INPUT_FORMAT = {
+    "json": InputFormat.JSON,
+    "parquet": InputFormat.PARQUET,
+    "csv": InputFormat.CSV,
+    "xlsx": InputFormat.XLSX,
+}
 
 
 DataObject = TypeVar("DataObject")
@@ -110,30 +110,123 @@ class PartitionReadFailure:
     reason: str  # or Any?
 
 
-# NOTE a namedtuple is preferable, but somehow cannot be cast to BiIterator[A, B]...
+# NOTE a namedtuple is preferable, but somehow cannot be cast to the Tuple alias...
 # class PartitionReadOutcome(NamedTuple, Generic[DataObject]):
 #     data: Iterable[DataObject]
 #     failures: Iterable[PartitionReadFailure]
 PartitionReadOutcome = Tuple[Iterable[DataObject], Iterable[PartitionReadFailure]]
 
+_shared_pool_worker = threading.local()
+
+
+def _mark_shared_pool_worker() -> None:
+    _shared_pool_worker.marked = True
+
+
+def _in_shared_pool_worker() -> bool:
+    """Whether the current thread is a worker of a process-wide pool. Its tasks must not submit to the shared pools
+    and wait -- with all the workers waiting so, nothing would be left to run the inner tasks. The nested work is
+    thus run inline instead, eg when a reader reads another table within its `read_single`."""
+    return getattr(_shared_pool_worker, "marked", False)
+
+
+def _shared_thread_pool(max_workers: int, thread_name_prefix: str) -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix=thread_name_prefix, initializer=_mark_shared_pool_worker
+    )
+
+
+class _InlineExecutor(Executor):
+    """Runs every submitted call right away in the calling thread, see `_in_shared_pool_worker`."""
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:  # type: ignore[override]
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+
+_INLINE_EXECUTOR = _InlineExecutor()
+# shared by all readers, so that neither the threads nor the connections of the fs clients are recreated per call
+_IO_POOL = _shared_thread_pool(int(os.environ.get("FSQL_IO_THREADS", "32")), "fsql-io")
+# local reads are not latency bound, so more threads than cores just contend for the GIL and inflate the memory
+_LOCAL_IO_POOL = _shared_thread_pool(os.cpu_count() or 1, "fsql-local-io")
+
+
+@lru_cache(maxsize=None)
+def _process_pool() -> ProcessPoolExecutor:
+    """Created on the first use only. The workers are started via forkserver where available, as forking a process
+    with running threads (our pools, the fs clients) is not safe."""
+    return ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=_mp_context())
+
+
+def _mp_context() -> multiprocessing.context.BaseContext:
+    start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(start_method)
+
+
+# the listings cache of an fs is shared by all the reading threads, thus invalidated at most once per interval
+_INVALIDATION_INTERVAL_SECONDS = 1.0
+_INVALIDATION_LOCK = threading.Lock()
+_LAST_INVALIDATION: WeakKeyDictionary[AbstractFileSystem, float] = WeakKeyDictionary()
+
+
+def _invalidate_cache(fs: AbstractFileSystem) -> None:
+    with _INVALIDATION_LOCK:
+        now = time.monotonic()
+        if now - _LAST_INVALIDATION.get(fs, -_INVALIDATION_INTERVAL_SECONDS) >= _INVALIDATION_INTERVAL_SECONDS:
+            fs.invalidate_cache()
+            _LAST_INVALIDATION[fs] = now
+
+
+def _reread_on_missing(
+    read_partition: Callable[..., PartitionReadOutcome], partition: Partition, fs: AbstractFileSystem, *args: Any
+) -> PartitionReadOutcome:
+    """Calls `read_partition(partition, fs, *args)`, retrying once with invalidated listings cache if the file went
+    missing."""
+    try:
+        return read_partition(partition, fs, *args)
+    except FileNotFoundError as e:
+        logger.warning(f"file {partition} reading exception {type(e)}, attempting cache invalidation and reread")
+        _invalidate_cache(fs)
+        return read_partition(partition, fs, *args)
+
+
+def _is_local(fs: AbstractFileSystem) -> bool:
+    protocols = fs.protocol if isinstance(fs.protocol, (tuple, list)) else (fs.protocol,)
+    return "file" in protocols
+
 
 class DataReader(Generic[DataObject]):
-    def __init__(self, input_format: InputFormat = InputFormat.AUTO, lazy_errors=False):
+    def __init__(
+        self,
+        input_format: InputFormat = InputFormat.AUTO,
+        lazy_errors=False,
+        cpu_parallelism: Literal["threads", "processes"] = "threads",
+    ):
         """
         * The `input_format is used to enforce the file format. The default AUTO represents recognition based
-          on suffix (see the `InputFormat.from_url`).
+          on the case-insensitive suffix (see the `InputFormat.from_url`).
         * When `lazy_errors` is False, a first error encountered in reading raises immediately; if True, it is
           instead stored in a list, and returned at the end, along with DataObject representing all partitions
           which encountered no errors.
+        * With `cpu_parallelism` set to "processes", the `read_single` runs in a process pool instead of threads.
+          Worth it only when the decoding dominates (large parquet or xlsx files), as the data objects are
+          pickled back to the caller. The reader and the `fs` must be picklable.
         """
+        if cpu_parallelism not in ("threads", "processes"):
+            raise ValueError(f"unsupported cpu_parallelism: {cpu_parallelism}")
         self.input_format = input_format
         self.lazy_errors = lazy_errors
+        self.cpu_parallelism = cpu_parallelism
 
     def detect_format(self, url: str) -> InputFormat:
         if self.input_format != InputFormat.AUTO:
             return self.input_format
         else:
-            return InputFormat.from_url(url.split(".")[-1])
+            return InputFormat.from_url(url.rpartition(".")[2].lower())
 
     @abstractmethod
     def read_single(self, partition: Partition, fs: AbstractFileSystem) -> PartitionReadOutcome:
@@ -144,22 +237,69 @@ class DataReader(Generic[DataObject]):
         raise NotImplementedError("abc")
 
     def read_and_concat(
-        self, partitions: Iterable[Partition], fs: AbstractFileSystem
+        self, partitions: Iterable[Partition], fs: AbstractFileSystem, max_workers: Optional[int] = None
+    ) -> Union[DataObject, DataObjectRich]:
+        """Reads all `partitions` via `read_single` in a thread pool and `concat`s the outcomes. The pool is shared
+        by all readers in the process, sized by the `FSQL_IO_THREADS` env variable (32 by default) -- or by the
+        number of cpus for the local filesystem -- unless `max_workers` asks for a dedicated one. For the "processes"
+        `cpu_parallelism`, the shared pool has a worker per cpu. When called from within a worker of the shared thread
+        pools, the reads run inline instead, see `_in_shared_pool_worker`."""
+        if self.cpu_parallelism == "processes":
+            if max_workers is None:
+                return self._read_and_concat(_process_pool(), partitions, fs)
+            with ProcessPoolExecutor(max_workers=max_workers, mp_context=_mp_context()) as ppe:
+                return self._read_and_concat(ppe, partitions, fs)
+        if max_workers is None:
+            if _in_shared_pool_worker():
+                return self._read_and_concat(_INLINE_EXECUTOR, partitions, fs)
+            return self._read_and_concat(_LOCAL_IO_POOL if _is_local(fs) else _IO_POOL, partitions, fs)
+        with ThreadPoolExecutor(max_workers=max_workers) as tpe:
+            return self._read_and_concat(tpe, partitions, fs)
+
+    def _read_and_concat(
+        self, executor: Executor, partitions: Iterable[Partition], fs: AbstractFileSystem
     ) -> Union[DataObject, DataObjectRich]:
         # TODO it is profoundly unfortunate that the return type is Union. Ideally, it would be a generic
         # type T that is bound with this union, and determined via lazy_error parameter which would be
         # not a boolean but instead a function [DataObject, T[DataObject]]. Alas, I was not able to pythonize
         # that. Note this would then apply to the api's signature as well
-        with ThreadPoolExecutor(max_workers=32) as tpe:  # TODO configurable worker count
-            partition_read_outcomes = tpe.map(partial(self.read_single, fs=fs), partitions)
-            if self.lazy_errors:
-                data_objects, failures = reduce(flatten_biiterator, partition_read_outcomes)
-                # no idea why but mypy complains here:
-                # Argument 1 to "DataObjectRich" has incompatible type "DataObject"; expected "DataObject"
-                return DataObjectRich(self.concat(data_objects), failures)  # type: ignore
-            else:
-                data_objects = chain(*(e[0] for e in partition_read_outcomes))
-                return self.concat(data_objects)
+        # the `partitions` may be still lazily discovered -- `map` submits each read as soon as it is yielded
+        partition_read_outcomes = list(executor.map(partial(self.read_single, fs=fs), partitions))
+        # concrete lists, so that eg `pd.concat` does not need to materialise a generator itself
+        data_objects = [data for outcome in partition_read_outcomes for data in outcome[0]]
+        if self.lazy_errors:
+            failures = [failure for outcome in partition_read_outcomes for failure in outcome[1]]
+            # no idea why but mypy complains here:
+            # Argument 1 to "DataObjectRich" has incompatible type "DataObject"; expected "DataObject"
+            return DataObjectRich(self.concat(data_objects), failures)  # type: ignore
+        else:
+            return self.concat(data_objects)
+
+
+@lru_cache(maxsize=16)
+def _arrow_fs(fs: AbstractFileSystem) -> Any:
+    """The filesystem for pyarrow's own IO, so that it reads the file via ranged requests instead of us handing it
+    a python file object. Note this is two code paths: the local filesystem is replaced by pyarrow's native one,
+    which memory maps the files, while any other `fs` is wrapped via `FSSpecHandler`, so that the user-configured
+    instance is used. Cached, as pyarrow would otherwise wrap anew for every file."""
+    from fsspec.implementations.local import LocalFileSystem
+    from pyarrow.fs import FSSpecHandler
+    from pyarrow.fs import LocalFileSystem as ArrowLocalFileSystem
+    from pyarrow.fs import PyFileSystem
+
+    if isinstance(fs, LocalFileSystem):
+        return ArrowLocalFileSystem(use_mmap=True)
+    return PyFileSystem(FSSpecHandler(fs))
+
+
+def _concat_tables(tables: list[Any]) -> Any:
+    """Concatenates pyarrow Tables, the columns missing in some of them are filled with nulls. The keyword for that
+    is `promote_options` since pyarrow 14, the older versions have `promote` instead."""
+    import pyarrow as pa
+
+    if int(pa.__version__.split(".")[0]) >= 14:
+        return pa.concat_tables(tables, promote_options="default")
+    return pa.concat_tables(tables, promote=True)
 
 
 class PandasReader(DataReader[pd.DataFrame]):
@@ -167,22 +307,75 @@ class PandasReader(DataReader[pd.DataFrame]):
     Behaviour can be customised via passing any kwargs to the constructor.
     """
 
-    def __init__(self, input_format=InputFormat.AUTO, lazy_errors=False, **pdread_kwargs):
-        """See DataReader for `lazy_errors` and `input_format`. The `pdread_kwargs` are passed
-        verbatim to the respective `pd.read_` method.
+    def __init__(
+        self,
+        input_format=InputFormat.AUTO,
+        lazy_errors=False,
+        arrow_concat=False,
+        cpu_parallelism: Literal["threads", "processes"] = "threads",
+        columns: Optional[list[str]] = None,
+        filters: Optional[list] = None,
+        **pdread_kwargs,
+    ):
+        """See DataReader for `lazy_errors`, `input_format` and `cpu_parallelism`. The `pdread_kwargs` are passed
+        verbatim to the respective `pd.read_` method. They are fixed at construction -- create a new reader to change
+        them.
+
+        Parquet files are read with pyarrow and `pre_buffer`, unless another `engine` is passed. Json files are read as
+        lines, with pandas' default engine. The pyarrow engine (`input_format=InputFormat.JSON, engine="pyarrow"`)
+        parses considerably faster, but is opt-in, as it infers the dtypes differently (eg ISO dates are parsed into
+        datetimes, and numeric-looking strings are kept as strings).
+
+        With `arrow_concat`, parquet files are read into pyarrow Tables instead of data frames, which are concatenated
+        and converted to a single frame at once in `concat` (each run of consecutive ones, so that the order of the
+        partitions in other formats is kept). Compared to `pd.concat` of the individual frames, this roughly halves
+        the peak memory. The resulting frame has a fresh RangeIndex. Requires the pyarrow engine, and is not usable
+        within the DaskReader.
+
+        The `columns` and `filters` are pushed down into parquet reads, the `columns` into csv reads as well (the csv
+        columns not present in a file are skipped silently, unlike in parquet). Other formats ignore them. The
+        partition columns may be listed in `columns` too -- they are not read from the file but added as usual. If the
+        `columns` are only partition columns, the files are still read for their row count.
+        The `filters` apply to the columns of the file, for the partition columns use the query instead.
         """
-        super().__init__(input_format=input_format, lazy_errors=lazy_errors)
-        self.pdread_user_kwargs = pdread_kwargs
-        self.pdread_default_kwargs = defaultdict(dict)
-        self.pdread_default_kwargs[InputFormat.PARQUET] = {
-            "engine": "fastparquet",
+        super().__init__(input_format=input_format, lazy_errors=lazy_errors, cpu_parallelism=cpu_parallelism)
+        if arrow_concat and pdread_kwargs.get("engine", "pyarrow") != "pyarrow":
+            raise ValueError(f"arrow_concat requires the pyarrow engine, got {pdread_kwargs['engine']}")
+        self.arrow_concat = arrow_concat
+        # the defaults and the user kwargs are merged once below, into the per-format `_pdread_kwargs`
+        defaults: defaultdict[InputFormat, dict[str, Any]] = defaultdict(dict)
+        if pdread_kwargs.get("engine", "pyarrow") == "pyarrow":
+            # pyarrow coalesces the column chunk reads and issues them in parallel -- for that, it needs the path
+            # and the fs instead of a file object (see `read_single`). It then decodes the row groups and columns
+            # of a single file in parallel as well, so that a large file does not pin just one thread
+            defaults[InputFormat.PARQUET] = {
+                "engine": "pyarrow",
+                "pre_buffer": True,
+                "use_threads": True,
+            }
+        defaults[InputFormat.JSON] = {
+            "lines": True,
         }
-        self.pdread_default_kwargs[InputFormat.JSON] = {
-            "lines": "true",
-        }
-        self.pdread_default_kwargs[InputFormat.XLSX] = {
+        defaults[InputFormat.XLSX] = {
             "engine": "openpyxl",
         }
+        self.columns = columns
+        pushdown = {key: value for key, value in (("columns", columns), ("filters", filters)) if value is not None}
+        if filters is not None and input_format not in (InputFormat.AUTO, InputFormat.PARQUET):
+            logger.warning(f"filters are supported for parquet only, ignoring them for {input_format}")
+        if columns is not None and input_format not in (InputFormat.AUTO, InputFormat.PARQUET, InputFormat.CSV):
+            logger.warning(f"columns are supported for parquet and csv only, ignoring them for {input_format}")
+        # merged once here rather than per partition in `read_single`
+        self._pdread_kwargs = {
+            file_format: {**defaults.get(file_format, {}), **pdread_kwargs} for file_format in InputFormat
+        }
+        self._pdread_kwargs[InputFormat.PARQUET].update(pushdown)
+        self._columns_set = frozenset(columns) if columns is not None else None
+        self._user_usecols = "usecols" in pdread_kwargs
+        if self._columns_set is not None:
+            # a predicate rather than a list, so that the partition columns need not be stripped per file. It is the
+            # bound method of a frozenset instead of a lambda, to stay picklable for the process pool
+            self._pdread_kwargs[InputFormat.CSV].setdefault("usecols", self._columns_set.__contains__)
 
     @classmethod
     def _format_to_reader(cls, input_format: InputFormat) -> Callable:
@@ -199,69 +392,154 @@ class PandasReader(DataReader[pd.DataFrame]):
         else:
             assert_exhaustive_enum(input_format)
 
+    def _read_df(
+        self, partition: Partition, fs: AbstractFileSystem, input_format: InputFormat, pdread_kwargs: dict[str, Any]
+    ) -> pd.DataFrame:
+        reader = self._format_to_reader(input_format)
+        if input_format is InputFormat.PARQUET and pdread_kwargs.get("engine") == "pyarrow":
+            return reader(partition.url, filesystem=_arrow_fs(fs), **pdread_kwargs)
+        with fs.open(partition.url, "rb") as fd:
+            return reader(fd, **pdread_kwargs)
+
+    def _read_table(self, partition: Partition, fs: AbstractFileSystem, pdread_kwargs: dict[str, Any]) -> Any:
+        """The `arrow_concat` counterpart of `_read_df` -- reads a parquet file into pyarrow Table."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        pqread_kwargs = {key: value for key, value in pdread_kwargs.items() if key != "engine"}
+        table = pq.read_table(partition.url, filesystem=_arrow_fs(fs), **pqread_kwargs)
+        for key, value in partition.columns.items():
+            # the partition value is a scalar, thus broadcast in C instead of materialising a python list first
+            table = table.append_column(key, pa.repeat(pa.scalar(value, pa.string()), table.num_rows))
+        return table
+
     def read_single(self, partition: Partition, fs: AbstractFileSystem) -> PartitionReadOutcome:
         logger.debug(f"read dataframe for partition {partition}")
         input_format = self.detect_format(partition.url)
         logger.debug(f"format detected for partition {input_format} <- {partition}")
-        reader = self._format_to_reader(input_format)
 
-        pdread_kwargs = {**self.pdread_default_kwargs[input_format], **self.pdread_user_kwargs}
+        pdread_kwargs = self._pdread_kwargs[input_format]
+        if (
+            input_format is InputFormat.PARQUET
+            and self.columns
+            and not partition.columns.keys().isdisjoint(self.columns)
+        ):
+            # the partition columns are constant, thus added after the read instead of looked up in the file
+            file_columns = [column for column in self.columns if column not in partition.columns]
+            pdread_kwargs = {**pdread_kwargs, "columns": file_columns}
+        elif input_format is InputFormat.CSV and self._only_partition_columns(partition):
+            # a csv read of no columns yields no rows either, unlike parquet -- thus the file is read in full, and its
+            # columns dropped after the read in `_read_partition`, so that the row count does not depend on the format
+            pdread_kwargs = {key: value for key, value in pdread_kwargs.items() if key != "usecols"}
         logger.debug(f"reader kwargs {pdread_kwargs} for partition {partition}")
 
-        def _read_internal(partition: Partition) -> PartitionReadOutcome:
-            with fs.open(partition.url, "rb") as fd:
-                try:
-                    df = reader(fd, **pdread_kwargs)
-                    for key, value in partition.columns.items():
-                        df[key] = value
-                    return [df], []
-                except ValueError as e:
-                    if not self.lazy_errors:
-                        raise
-                    else:
-                        return [], [PartitionReadFailure(partition, str(e))]
+        return _reread_on_missing(self._read_partition, partition, fs, input_format, pdread_kwargs)
 
-        try:
-            result = _read_internal(partition)
-        except FileNotFoundError as e:
-            logger.warning(f"file {partition} reading exception {type(e)}, attempting cache invalidation and reread")
-            fs.invalidate_cache()
-            result = _read_internal(partition)
+    def _only_partition_columns(self, partition: Partition) -> bool:
+        """Whether `columns` select no column of the file itself, only the partition columns (or none at all).
+        Not applied when the user passes own `usecols`, those then take effect as given."""
+        if self._columns_set is None or self._user_usecols:
+            return False
+        return partition.columns.keys() >= self._columns_set
 
-        return result
+    def _read_partition(
+        self, partition: Partition, fs: AbstractFileSystem, input_format: InputFormat, pdread_kwargs: dict[str, Any]
+    ) -> PartitionReadOutcome:
+        try:
+            if self.arrow_concat and input_format is InputFormat.PARQUET:
+                return [self._read_table(partition, fs, pdread_kwargs)], []
+            df = self._read_df(partition, fs, input_format, pdread_kwargs)
+            if input_format is InputFormat.CSV and self._only_partition_columns(partition):
+                df = df.iloc[:, :0]
+            for key, value in partition.columns.items():
+                df[key] = value
+            return [df], []
+        except ValueError as e:
+            if not self.lazy_errors:
+                raise
+            else:
+                return [], [PartitionReadFailure(partition, str(e))]
 
     def concat(self, data: Iterable[pd.DataFrame]) -> pd.DataFrame:
-        return pd.concat(data)
+        if not self.arrow_concat:
+            return pd.concat(data)
+        # the consecutive tables are converted at once, keeping the order of the partitions with the other formats
+        pieces: list[pd.DataFrame] = []
+        for is_frame, run in groupby(data, key=lambda e: isinstance(e, pd.DataFrame)):
+            if is_frame:
+                pieces.extend(run)
+            else:
+                # self_destruct releases the arrow buffers as they are converted, the split_blocks is required for that
+                table = _concat_tables(list(run))
+                pieces.append(table.to_pandas(split_blocks=True, self_destruct=True, use_threads=True))
+        return pieces[0] if len(pieces) == 1 else pd.concat(pieces, ignore_index=True)
 
 
 PANDAS_READER = PandasReader()
 
 
+class ArrowTableReader(PandasReader):
+    """Like the PandasReader with `arrow_concat`, but returns the concatenated pyarrow Table instead of converting it
+    to a single data frame. The concatenation just collects the record batches of the individual tables, no data is
+    copied -- convert via `to_pandas` or iterate the `to_batches` only once needed. Requires pyarrow.
+    Non-parquet files are read via pandas and converted.
+    """
+
+    def __init__(
+        self,
+        input_format=InputFormat.AUTO,
+        lazy_errors=False,
+        cpu_parallelism: Literal["threads", "processes"] = "threads",
+        **pdread_kwargs,
+    ):
+        """See PandasReader, except for the `arrow_concat` which is always on."""
+        super().__init__(
+            input_format=input_format,
+            lazy_errors=lazy_errors,
+            arrow_concat=True,
+            cpu_parallelism=cpu_parallelism,
+            **pdread_kwargs,
+        )
+
+    def concat(self, data: Iterable[Any]) -> Any:
+        import pyarrow as pa
+
+        tables = [e if isinstance(e, pa.Table) else pa.Table.from_pandas(e, preserve_index=False) for e in data]
+        return _concat_tables(tables)
+
+
 class EnumeratedDictReader(DataReader[dict]):
+    def __init__(
+        self,
+        input_format: InputFormat = InputFormat.AUTO,
+        lazy_errors: bool = False,
+        json_loads: Callable[[bytes], Any] = json.loads,
+        cpu_parallelism: Literal["threads", "processes"] = "threads",
+    ):
+        """See DataReader for `lazy_errors`, `input_format` and `cpu_parallelism`. The `json_loads` parses the raw
+        content of a file -- pass eg `orjson.loads` for a faster decoding. Its errors must subclass
+        `json.JSONDecodeError` (as orjson's do) to be subject to `lazy_errors`."""
+        super().__init__(input_format=input_format, lazy_errors=lazy_errors, cpu_parallelism=cpu_parallelism)
+        self.json_loads = json_loads
+
     def read_single(self, partition: Partition, fs: AbstractFileSystem) -> PartitionReadOutcome:
         logger.debug(f"read single for partition {partition}")
         input_format = self.detect_format(partition.url)
         if input_format != InputFormat.JSON:
             raise ValueError(f"EnumeratedDictReader supports only json, not {input_format}. Partition is {partition}")
 
-        def _read_internal(partition: Partition) -> PartitionReadOutcome:
-            with fs.open(partition.url, "r") as fd:
-                try:
-                    base = json.load(fd)
-                    return [{**base, **partition.columns}], []
-                except json.decoder.JSONDecodeError as e:
-                    if not self.lazy_errors:
-                        raise
-                    else:
-                        return [], [PartitionReadFailure(partition, str(e))]
+        return _reread_on_missing(self._read_partition, partition, fs)
 
-        try:
-            result = _read_internal(partition)
-        except FileNotFoundError as e:
-            logger.warning(f"file {partition} reading exception {type(e)}, attempting cache invalidation and reread")
-            fs.invalidate_cache()
-            result = _read_internal(partition)
-        return result
+    def _read_partition(self, partition: Partition, fs: AbstractFileSystem) -> PartitionReadOutcome:
+        with fs.open(partition.url, "rb") as fd:
+            try:
+                base = self.json_loads(fd.read())
+                return [{**base, **partition.columns}], []
+            except json.decoder.JSONDecodeError as e:
+                if not self.lazy_errors:
+                    raise
+                else:
+                    return [], [PartitionReadFailure(partition, str(e))]
 
     def concat(self, data: Iterable[dict]) -> dict:
         return dict(enumerate(data))
@@ -284,7 +562,7 @@ class FileInPartition:
             logger.warning(
                 f"file {self.file_url} reading exception {type(e)}, attempting cache invalidation and reread"
             )
-            self.fs.invalidate_cache()
+            _invalidate_cache(self.fs)
             with self.fs.open(self.file_url) as fd:
                 return fd_consumer(fd)
 
@@ -1,9 +1,8 @@
 from __future__ import annotations
 
-import itertools
 import logging
 from collections.abc import Iterable
-from typing import Any, Iterator
+from typing import Any
 
 import dask
 import dask.dataframe as dd
@@ -30,13 +29,16 @@ class DaskReader(DataReader):
             logger.warning("provided pandas reader has lazy_errors=True, which makes no sense as it is delayed")
         self.pandas_reader = pandas_reader if pandas_reader else PandasReader(lazy_errors=False)
         self.meta = meta
+        # wrapped once, every partition is then just a call of the same delayed function
+        self._delayed_read = dask.delayed(self._read_frame)
+
+    def _read_frame(self, partition: Partition, fs: AbstractFileSystem) -> Any:
+        # PandasReader returns PartitionReadOutcome, not DataFrame -- so we need to convert accordingly
+        return self.pandas_reader.read_single(partition, fs)[0][0]
 
     def read_single(self, partition: Partition, fs: AbstractFileSystem) -> PartitionReadOutcome:
         try:
-            # PandasReader returns PartitionReadOutcome, not DataFrame -- so we need to convert accordingly
-            convert = lambda pandas_outcome: pandas_outcome[0][0]  # noqa: E731
-            delayed_reader = lambda partition, fs: convert(self.pandas_reader.read_single(partition, fs))  # noqa: E731
-            return [dask.delayed(delayed_reader)(partition, fs)], []
+            return [self._delayed_read(partition, fs)], []
         except ValueError as e:
             if not self.lazy_errors:
                 raise
@@ -44,13 +46,12 @@ class DaskReader(DataReader):
                 return [], [PartitionReadFailure(partition, str(e))]
 
     def concat(self, data: Iterable[Any]) -> Any:  # TODO generics on the Any... which is tricky as dd aint Delayed!
-        if self.meta:
-            dd_iter: Iterator[Any] = (dd.from_delayed(e, meta=self.meta) for e in data)
-        else:
-            iterator = iter(data)
-            head = next(iterator).compute()
-            tail = (dd.from_delayed(e, meta=head) for e in iterator)
-            head_dd = dd.from_pandas(head, npartitions=1)
-            dd_iter = itertools.chain([head_dd], tail)
-        # looks like a nuissance of dask, they require list instead of any Iterable...
-        return dd.concat(list(dd_iter))
+        # a single `from_delayed` over all the partitions, instead of concatenating a dask frame per partition,
+        # keeps the graph at one node per partition
+        delayeds = list(data)
+        meta = self.meta
+        if meta is None:
+            head = delayeds[0].compute()
+            delayeds[0] = dask.delayed(head)
+            meta = head.iloc[:0]
+        return dd.from_delayed(delayeds, meta=meta)
@@ -7,11 +7,16 @@ from dataclasses import dataclass
 from typing import Optional
 
 
-@dataclass
+@dataclass(frozen=True)
 class Partition:
+    __slots__ = ("url", "columns")
     url: str
     columns: dict[str, str]
 
+    def __reduce__(self):
+        # the default pickling of slotted instances restores via setattr, which the frozen dataclass forbids
+        return (Partition, (self.url, self.columns))
+
     def expand_by(self, url_suffix: str, key_val: Optional[tuple[str, str]]) -> Partition:
         columns_ext = copy(self.columns)
         if key_val:
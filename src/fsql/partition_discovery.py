@@ -13,65 +13,167 @@ to be customisable.
 from __future__ import annotations
 
 import logging
-from collections.abc import Iterable
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+from concurrent.futures import Executor
 from dataclasses import dataclass
-from itertools import chain, groupby
+from functools import partial
+from itertools import chain
+from typing import Optional
 
 from fsspec.spec import AbstractFileSystem
 
+from fsql import ls_cached
 from fsql.column_parser import ColumnParser
 from fsql.partition import Partition
 from fsql.query import Query
 
 logger = logging.getLogger(__name__)
-flat_map = lambda f, xs: (y for ys in xs for y in f(ys))  # noqa: E731
 
 
 @dataclass
 class DirectoryListing:
     files: Iterable[str]
     directories: Iterable[str]
+    # the directories were prescribed by the query, not observed on the filesystem, thus may not exist
+    speculative: bool = False
 
 
 def list_directory(url: str, fs: AbstractFileSystem) -> DirectoryListing:
-    listing_raw = fs.ls(url, detail=True)
+    listing_raw = ls_cached(fs, url)
     logger.debug(f"url {url} listed to {len(listing_raw)} elements")
-    selector = lambda e: e["type"]  # noqa: E731
-    extractor = lambda l: sorted(list(map(lambda e: e["name"].split("/")[-1], l)))  # noqa: E731
-    # we need the extractor to materialise to list, because the groupby iterator is shared
-    listing_grouped = {k: extractor(v) for k, v in groupby(sorted(listing_raw, key=selector), selector)}
-    listing = DirectoryListing(files=listing_grouped.get("file", []), directories=listing_grouped.get("directory", []))
+    files: list[str] = []
+    directories: list[str] = []
+    for e in listing_raw:
+        if e["type"] == "file":
+            files.append(e["name"].rpartition("/")[2])
+        elif e["type"] == "directory":
+            directories.append(e["name"].rpartition("/")[2])
+    files.sort()
+    directories.sort()
+    listing = DirectoryListing(files=files, directories=directories)
     logger.debug(f"url {url} listed to {listing}")
     return listing
 
 
+def list_tree(url: str, fs: AbstractFileSystem) -> dict[str, DirectoryListing]:
+    """Lists the whole subtree of `url` via a single `find`, and splits it into per-directory listings, keyed
+    by the directory name as normalised by the `fs`. On object stores, this amounts to a single paginated
+    prefix scan, instead of a request per every directory."""
+    tree_raw = fs.find(url, withdirs=True, detail=True)
+    logger.debug(f"url {url} tree listed to {len(tree_raw)} elements")
+    files: dict[str, list[str]] = defaultdict(list)
+    directories: dict[str, list[str]] = defaultdict(list)
+    for name, info in tree_raw.items():
+        parent, _, item = name.rpartition("/")
+        # the other types, eg links, are skipped, the same as in `list_directory`
+        if info["type"] == "file":
+            files[parent].append(item)
+        elif info["type"] == "directory":
+            directories[parent].append(item)
+    return {
+        parent: DirectoryListing(files=sorted(files[parent]), directories=sorted(directories[parent]))
+        for parent in set(files.keys()) | set(directories.keys())
+    }
+
+
+def _get_listing(
+    column_parser: ColumnParser,
+    partition: Partition,
+    lister: Callable[[str], DirectoryListing],
+    query: Query,
+    speculative: bool,
+) -> DirectoryListing:
+    generated_partitions = column_parser.generate()
+    from_query = False
+    if not generated_partitions and not column_parser.is_terminal_level():
+        # we don't generate files from query, as we would have no guarantee of their existence
+        generated_partitions = column_parser.generate_from_query(query)
+        from_query = True
+    if speculative:
+        # we have to list anyway, to find out whether the partition exists at all -- but we restrict by generation
+        try:
+            listing = lister(partition.url)
+        except FileNotFoundError:
+            logger.debug(f"speculative partition {partition} does not exist")
+            return DirectoryListing(files=[], directories=[])
+        if generated_partitions is not None:
+            allowed = set(generated_partitions)
+            if column_parser.is_terminal_level():
+                return DirectoryListing(files=[e for e in listing.files if e in allowed], directories=[])
+            else:
+                return DirectoryListing(files=[], directories=[e for e in listing.directories if e in allowed])
+        return listing
+    if generated_partitions is not None and (generated_partitions or from_query):
+        if column_parser.is_terminal_level():
+            return DirectoryListing(files=generated_partitions, directories=[])
+        else:
+            return DirectoryListing(files=[], directories=generated_partitions, speculative=from_query)
+    else:
+        return lister(partition.url)
+
+
 def discover_partitions(
-    query: Query, column_parser: ColumnParser, partition: Partition, fs: AbstractFileSystem
+    query: Query,
+    column_parser: ColumnParser,
+    partition: Partition,
+    fs: AbstractFileSystem,
+    executor: Optional[Executor] = None,
 ) -> Iterable[Partition]:
-    # NOTE expose in the query the option to look at last item only, do the expand by as a flat map
+    """Lists the `partition` and recursively all its subpartitions accepted by the `query`.
 
+    If the `column_parser` has a known depth given the `query` (see `ColumnParser.known_depth`), the whole subtree
+    is listed upfront via `list_tree`. Otherwise, if `executor` is provided, listings of all sibling subdirectories are
+    submitted to it at once, so that the (remote) `ls` calls of a single level overlap instead of being issued
+    one after another. The crawl itself stays depth-first, thus the order of the discovered partitions is not
+    affected by either."""
     # NOTE this whole thing is quite hacky. Before querying fs, we check whether the user has prescribed the
     # values for columns at this stage exactly. The weird thing is that we still parse and query those columns later,
     # but that may actually be upside. Also, the separation between files and directories does feel a bit artificial
     # here
     logger.debug(f"partition discovery with query {query} and partition {partition}")
     if not partition.url.endswith("/"):
-        partition.url += "/"  # required due to fsspec.ls not appending '/' to listed directories
-    generated_partitions = column_parser.generate()
-    if generated_partitions:
-        if column_parser.is_terminal_level():
-            listing = DirectoryListing(files=generated_partitions, directories=[])
-        else:
-            listing = DirectoryListing(files=[], directories=[partition + "/" for partition in generated_partitions])
+        partition = Partition(partition.url + "/", partition.columns)
+    lister: Callable[[str], DirectoryListing]
+    if column_parser.known_depth(query) is not None:
+        tree = list_tree(partition.url, fs)
+        empty = DirectoryListing(files=[], directories=[])
+        lister = lambda url: tree.get(fs._strip_protocol(url).rstrip("/"), empty)  # noqa: E731
+        executor = None  # nothing remote left to parallelise
     else:
-        listing = list_directory(partition.url, fs)
-
-    subdir_partitions = (partition.expand_by(item, column_parser(item)) for item in listing.directories)
+        lister = partial(list_directory, fs=fs)
+    listing = _get_listing(column_parser, partition, lister, query, False)
+    return _discover_listed(query, column_parser, partition, listing, lister, executor)
+
+
+def _discover_listed(
+    query: Query,
+    column_parser: ColumnParser,
+    partition: Partition,
+    listing: DirectoryListing,
+    lister: Callable[[str], DirectoryListing],
+    executor: Optional[Executor],
+) -> Iterable[Partition]:
+    # NOTE expose in the query the option to look at last item only, do the expand by as a flat map
+    # the '/' is required due to fsspec.ls not appending it to listed directories
+    subdir_partitions = (partition.expand_by(item + "/", column_parser(item)) for item in listing.directories)
     subdir_partitions_flt = filter(lambda partition: query.eval_available(partition.columns), subdir_partitions)
-    # NOTE paralellisation opportunity! We don't need this to be sequential
-    subdir_partitions_exp = flat_map(
-        lambda partition: discover_partitions(query, column_parser.tail(partition), partition, fs),
-        subdir_partitions_flt,
+    subdir_nodes = [(subdir, column_parser.tail(subdir)) for subdir in subdir_partitions_flt]
+    if executor:
+        # we submit the whole level at once, but consume lazily and in order -- only the main thread waits
+        futures = [
+            executor.submit(_get_listing, parser, subdir, lister, query, listing.speculative)
+            for subdir, parser in subdir_nodes
+        ]
+        sublistings: Iterable[DirectoryListing] = (future.result() for future in futures)
+    else:
+        sublistings = (
+            _get_listing(parser, subdir, lister, query, listing.speculative) for subdir, parser in subdir_nodes
+        )
+    subdir_partitions_exp = (
+        subpartition
+        for (subdir, parser), sublisting in zip(subdir_nodes, sublistings)
+        for subpartition in _discover_listed(query, parser, subdir, sublisting, lister, executor)
     )
 
     file_partitions_flt: Iterable[Partition] = iter(())
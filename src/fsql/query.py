@@ -1,5 +1,8 @@
 """Handles filtering of the partitions prior to being read, based on values of partition columns.
 
+Queries may additionally prescribe the values a column can possibly have (see `Query.generate`) -- the partition
+discovery then does not need to list the parent directory, but instead checks just the prescribed candidates.
+
 TODO Document more:
  - factory-based approach
  - partial query evaluation
@@ -7,17 +10,14 @@ TODO Document more:
 from __future__ import annotations
 
 import inspect
+import sys
 from abc import ABC, abstractmethod
-from collections.abc import Iterable
+from collections.abc import Iterable, Sequence
 from dataclasses import dataclass, field
 from enum import Enum, auto
-from typing import Callable, Optional
-
-# TODO
-# - query should impl some caching mechanism for partitions, to not re-eval over and over
-# - query could impl an optional "generate" method and have an ColEq factory method,
-#   to speed up discovery with conditions like 'day=13'. This requires auto column parser
-#   to allow for column order specs
+from functools import lru_cache, reduce
+from operator import itemgetter
+from typing import Any, Callable, Optional
 
 
 class Query(ABC):
@@ -29,6 +29,28 @@ class Query(ABC):
     def eval_available(self, columns: dict[str, str]) -> bool:
         raise NotImplementedError("abc")
 
+    def generate(self, column: str) -> Optional[list[str]]:
+        """All values of the `column` that can possibly satisfy the query, or None if this is not known.
+        Used by partition discovery to skip listing of a directory whose children are fully prescribed.
+        The column order is known only to the column parser, which thus has to have its grammar specified."""
+        return None
+
+    def cost_hint(self) -> int:
+        """A rough relative cost of a single evaluation, used by `optimize` to order the operands of AND/OR."""
+        return 10
+
+    def optimize(self) -> Query:
+        """An equivalent query which is possibly cheaper to evaluate -- see `AndQuery.optimize`."""
+        return self
+
+
+def _and(lr: bool, rr: bool) -> bool:
+    return lr and rr
+
+
+def _or(lr: bool, rr: bool) -> bool:
+    return lr or rr
+
 
 class BooleanOperatorQuery(Query):
     def __init__(self, left: Query, right: Query, operator: Callable[[bool, bool], bool]):
@@ -42,25 +64,168 @@ class BooleanOperatorQuery(Query):
     def eval_available(self, columns: dict[str, str]) -> bool:
         return self.operator(self.left.eval_available(columns), self.right.eval_available(columns))
 
+    def cost_hint(self) -> int:
+        return self.left.cost_hint() + self.right.cost_hint()
+
+    def generate(self, column: str) -> Optional[list[str]]:
+        if self.operator is _and:
+            return _generate_and(self.left.generate(column), self.right.generate(column))
+        elif self.operator is _or:
+            return _generate_or(self.left.generate(column), self.right.generate(column))
+        else:
+            return None
+
+
+def _generate_and(left: Optional[list[str]], right: Optional[list[str]]) -> Optional[list[str]]:
+    if left is None or right is None:
+        return right if left is None else left
+    return [value for value in left if value in right]
+
+
+def _generate_or(left: Optional[list[str]], right: Optional[list[str]]) -> Optional[list[str]]:
+    if left is None or right is None:
+        return None
+    return left + [value for value in right if value not in left]
+
+
+class AndQuery(BooleanOperatorQuery):
+    """The conjunction, short-circuited -- the right side is not evaluated once the left one fails."""
+
+    def __init__(self, left: Query, right: Query):
+        super().__init__(left, right, _and)
+
+    def eval_all(self, columns: dict[str, str]) -> bool:
+        return self.left.eval_all(columns) and self.right.eval_all(columns)
+
+    def eval_available(self, columns: dict[str, str]) -> bool:
+        return self.left.eval_available(columns) and self.right.eval_available(columns)
+
+    def optimize(self) -> Query:
+        """Flattens the nested conjunctions into a single AllQuery, with the conjuncts ordered by their `cost_hint` --
+        so that the cheap ones short-circuit the expensive ones."""
+        return AllQuery(_ordered_operands(self, AndQuery, AllQuery))
+
+
+class OrQuery(BooleanOperatorQuery):
+    """The disjunction, short-circuited -- the right side is not evaluated once the left one succeeds."""
+
+    def __init__(self, left: Query, right: Query):
+        super().__init__(left, right, _or)
+
+    def eval_all(self, columns: dict[str, str]) -> bool:
+        return self.left.eval_all(columns) or self.right.eval_all(columns)
+
+    def eval_available(self, columns: dict[str, str]) -> bool:
+        return self.left.eval_available(columns) or self.right.eval_available(columns)
+
+    def optimize(self) -> Query:
+        """See `AndQuery.optimize`, the result is an AnyQuery."""
+        return AnyQuery(_ordered_operands(self, OrQuery, AnyQuery))
+
+
+class AllQuery(Query):
+    """The n-ary conjunction, short-circuited. Evaluates in a single loop, instead of a frame per nested AndQuery."""
+
+    def __init__(self, operands: Sequence[Query]):
+        self.operands = tuple(operands)
+
+    def eval_all(self, columns: dict[str, str]) -> bool:
+        for operand in self.operands:
+            if not operand.eval_all(columns):
+                return False
+        return True
+
+    def eval_available(self, columns: dict[str, str]) -> bool:
+        for operand in self.operands:
+            if not operand.eval_available(columns):
+                return False
+        return True
+
+    def cost_hint(self) -> int:
+        return sum(operand.cost_hint() for operand in self.operands)
+
+    def generate(self, column: str) -> Optional[list[str]]:
+        return reduce(_generate_and, (operand.generate(column) for operand in self.operands))
+
+
+class AnyQuery(Query):
+    """The n-ary disjunction, see AllQuery."""
+
+    def __init__(self, operands: Sequence[Query]):
+        self.operands = tuple(operands)
+
+    def eval_all(self, columns: dict[str, str]) -> bool:
+        for operand in self.operands:
+            if operand.eval_all(columns):
+                return True
+        return False
+
+    def eval_available(self, columns: dict[str, str]) -> bool:
+        for operand in self.operands:
+            if operand.eval_available(columns):
+                return True
+        return False
+
+    def cost_hint(self) -> int:
+        return sum(operand.cost_hint() for operand in self.operands)
+
+    def generate(self, column: str) -> Optional[list[str]]:
+        return reduce(_generate_or, (operand.generate(column) for operand in self.operands))
+
+
+def _operands(query: Query, binary_class: type, nary_class: type) -> list[Query]:
+    if isinstance(query, BooleanOperatorQuery) and type(query) is binary_class:
+        return _operands(query.left, binary_class, nary_class) + _operands(query.right, binary_class, nary_class)
+    if isinstance(query, (AllQuery, AnyQuery)) and type(query) is nary_class:
+        return [e for operand in query.operands for e in _operands(operand, binary_class, nary_class)]
+    return [query.optimize()]
+
+
+def _ordered_operands(query: Query, binary_class: type, nary_class: type) -> list[Query]:
+    # the sort is stable, thus the user's order is kept among equally costly operands
+    return sorted(_operands(query, binary_class, nary_class), key=lambda operand: operand.cost_hint())
+
 
 class AtomicQuery(Query):
-    def __init__(self, f: Callable, columns: Optional[set[str]] = None):
+    def __init__(self, f: Callable, columns: Optional[set[str]] = None, values: Optional[list[str]] = None):
+        """The `values`, if provided, are all the values of the (single) column for which `f` may be true.
+
+        The `f` is assumed to be pure -- it is memoized on the values of its columns, as those repeat across
+        many partitions (e.g., the same month under every year)."""
         self.f = f
+        self.values = values
         if columns:  # TODO this is to impl the Q_EQ, feels hacky
-            self.columns = columns
+            self.columns = frozenset(columns)
         else:
-            args = inspect.getfullargspec(f).args
-            self.columns = set(args)
+            code = getattr(f, "__code__", None)
+            # plain functions expose their positional args directly, the inspect is needed only for other callables
+            args = code.co_varnames[: code.co_argcount] if code else inspect.getfullargspec(f).args
+            self.columns = frozenset(args)
+        self._columns_ordered = tuple(sorted(self.columns))
+        # the projection is done in C -- note the itemgetter of a single column returns the bare value, not a tuple
+        self._project: Callable[[dict[str, str]], Any] = (
+            itemgetter(*self._columns_ordered) if self._columns_ordered else lambda columns: ()
+        )
+        self._f_cached = lru_cache(maxsize=1 << 15)(self._f_projected)
+
+    def _f_projected(self, projection: Any) -> bool:
+        values = (projection,) if len(self._columns_ordered) == 1 else projection
+        return self.f(**dict(zip(self._columns_ordered, values)))
 
     def eval_all(self, columns: dict[str, str]) -> bool:
-        if not self.columns.issubset(columns.keys()):
+        if not self.columns <= columns.keys():
             return False
-        return self.f(**{key: val for key, val in columns.items() if key in self.columns})
+        return self._f_cached(self._project(columns))
 
     def eval_available(self, columns: dict[str, str]) -> bool:
-        if not self.columns.issubset(columns.keys()):
+        if not self.columns <= columns.keys():
             return True
-        return self.f(**{key: val for key, val in columns.items() if key in self.columns})
+        return self._f_cached(self._project(columns))
+
+    def generate(self, column: str) -> Optional[list[str]]:
+        if self.values is None or self.columns != {column}:
+            return None
+        return self.values
 
 
 # NOTE for some reason, the following lines were not understood by mypyc
@@ -70,31 +235,59 @@ class AtomicQuery(Query):
 
 
 def Q_AND(l: Query, r: Query) -> Query:  # noqa: E741
-    return BooleanOperatorQuery(l, r, lambda lr, rr: lr and rr)
+    return AndQuery(l, r)
 
 
 def Q_OR(l: Query, r: Query) -> Query:  # noqa: E741
-    return BooleanOperatorQuery(l, r, lambda lr, rr: lr or rr)
+    return OrQuery(l, r)
 
 
-def Q_EQ(column: str, value: str):
-    def f(**columns):  # TODO how to define f(`column`) ? That would simplify AtomicQuery then
-        return columns[column] == value
+_MISSING = object()
+
+
+class EqQuery(AtomicQuery):
+    """The `column == value`, the most common query -- evaluated by a single dict lookup, instead of via `f`."""
+
+    def __init__(self, column: str, value: str):
+        def f(**columns):  # TODO how to define f(`column`) ? That would simplify AtomicQuery then
+            return columns[column] == value
+
+        super().__init__(f, set([column]), [value])
+        self.column = column
+        # the partition values are interned by the column parsers, thus mostly compared by identity
+        self.value = sys.intern(value) if isinstance(value, str) else value
+
+    def cost_hint(self) -> int:
+        return 1
+
+    def eval_all(self, columns: dict[str, str]) -> bool:
+        return columns.get(self.column, _MISSING) == self.value
 
-    return AtomicQuery(f, set([column]))
+    def eval_available(self, columns: dict[str, str]) -> bool:
+        actual = columns.get(self.column, _MISSING)
+        return actual is _MISSING or actual == self.value
+
+
+def Q_EQ(column: str, value: str):
+    return EqQuery(column, value)
 
 
 def Q_IN(column: str, values: Iterable):
+    values_l = list(values)
+
     def f(**columns):
-        return columns[column] in values
+        return columns[column] in values_l
 
-    return AtomicQuery(f, set([column]))
+    return AtomicQuery(f, set([column]), values_l)
 
 
 class ConstantQuery(Query):
     def __init__(self, value: bool):
         self.constant = value
 
+    def cost_hint(self) -> int:
+        return 0
+
     def eval_all(self, columns: dict[str, str]) -> bool:
         return self.constant
 
@@ -112,17 +305,27 @@ class ColumnComparator(Enum):
     wld = auto()
 
     def compare(self, a: str, b: str) -> int:
-        if self is ColumnComparator.wld:
-            return 0
-        elif self is ColumnComparator.num:
-            return int(a) - int(b)
-        elif self is ColumnComparator.lex:
-            if a < b:
-                return -1
-            elif a == b:
-                return 0
-            else:
-                return 1
+        return _COMPARATOR_FUNCTIONS[self](a, b)
+
+
+def _compare_lex(a: str, b: str) -> int:
+    return (a > b) - (a < b)
+
+
+def _compare_num(a: str, b: str) -> int:
+    return int(a) - int(b)
+
+
+def _compare_wld(a: str, b: str) -> int:
+    return 0
+
+
+# outside of the enum, as it would otherwise become its member
+_COMPARATOR_FUNCTIONS: dict[ColumnComparator, Callable[[str, str], int]] = {
+    ColumnComparator.lex: _compare_lex,
+    ColumnComparator.num: _compare_num,
+    ColumnComparator.wld: _compare_wld,
+}
 
 
 @dataclass
@@ -137,6 +340,15 @@ class ColumnRange:
             raise ValueError(f"invalid range: {self}")
 
 
+def _parsed_bounds(column_range: ColumnRange) -> Optional[tuple[Callable[[str], Any], Any, Any]]:
+    """The parse of the partition values along with the bounds parsed already, or None for the wildcard.
+    The parsed values are then compared as in the respective `ColumnComparator`."""
+    if column_range.column_comparator is ColumnComparator.wld:
+        return None
+    parse: Callable[[str], Any] = int if column_range.column_comparator is ColumnComparator.num else str
+    return parse, parse(column_range.min_value), parse(column_range.max_value)
+
+
 class LexRangeQuery(Query):
     """This is a query to return all files that lie >= c1=s1/c2=s2/... but < c1=e1/c2=e2/...
     It is a lexicographical comparator -- if c1<e1, then c2 can be well above e2 but the file is still accepted.
@@ -154,18 +366,31 @@ class LexRangeQuery(Query):
 
     def __init__(self, ranges: list[ColumnRange]):
         self.ranges = ranges
+        self._bounds = tuple(_parsed_bounds(c) for c in ranges)
+        # memoized on the values of the range columns, as those repeat across partitions -- see AtomicQuery
+        self._eval_cached = lru_cache(maxsize=1 << 15)(self._eval_values)
 
     def _eval_generic(self, columns: dict[str, str], on_early_stop: bool) -> bool:
-        at_minimum = False
-        at_maximum = False
+        values = []
         for c in self.ranges:
             if c.name not in columns:
+                break
+            values.append(columns[c.name])
+        return self._eval_cached(tuple(values), on_early_stop)
+
+    def _eval_values(self, values: tuple[str, ...], on_early_stop: bool) -> bool:
+        """The `values` are of the leading ranges, up to the first column not available."""
+        at_minimum = False
+        at_maximum = False
+        for i, bounds in enumerate(self._bounds):
+            if i == len(values):
                 return on_early_stop
-            if c.column_comparator == ColumnComparator.wld:
+            if bounds is None:
                 continue
-            value = columns[c.name]
-            left = c.column_comparator.compare(c.min_value, value)
-            right = c.column_comparator.compare(value, c.max_value)
+            parse, min_value, max_value = bounds
+            value = parse(values[i])
+            left = (min_value > value) - (min_value < value)
+            right = (value > max_value) - (value < max_value)
             if (left < 0 or at_maximum) and (right < 0 or at_minimum):
                 return True
             if left == 0:
@@ -177,6 +402,9 @@ class LexRangeQuery(Query):
             return False
         return not at_maximum
 
+    def cost_hint(self) -> int:
+        return 2
+
     def eval_all(self, columns: dict[str, str]) -> bool:
         return self._eval_generic(columns, False)
 
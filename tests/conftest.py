@@ -15,6 +15,10 @@ class Helper:
         with self.s3fs.open(url, "wb") as fd:
             fd.write(data)
 
+    def put_s3_files(self, mapping):
+        """Uploads all `url: data` pairs in a single batched call."""
+        self.s3fs.pipe(mapping)
+
     def read_json_file(self, url):
         with self.s3fs.open(url, "r") as fd:
             return json.load(fd)
@@ -41,3 +41,22 @@ def test_lazy_errors(tmp_path):
     result = read_partitioned_table(f"file://{case1_path}/", Q_TRUE, data_reader=lazy_reader)
     assert result.data == {0: json.loads(data1)}
     assert [error_line] == [e.reason for e in result.failures]
+
+
+def test_json_loads(tmp_path):
+    """A custom decoder, such as orjson, can be plugged in."""
+    case1_path = tmp_path / "table1"
+    case1_path.mkdir(parents=True)
+    with open(case1_path / "f1.json", "w") as fd:
+        fd.write("""{"c1": 4}""")
+
+    calls = []
+
+    def json_loads(content):
+        calls.append(content)
+        return json.loads(content)
+
+    reader = EnumeratedDictReader(json_loads=json_loads)
+    result = read_partitioned_table(f"file://{case1_path}/", Q_TRUE, data_reader=reader)
+    assert result == {0: {"c1": 4}}
+    assert calls == [b"""{"c1": 4}"""]
@@ -55,12 +55,16 @@ def test_default_format(helper):
     bucket = "test-bouquet"
     fs = helper.s3fs
     fs.mkdir(bucket)
-    helper.put_s3_file(b'{"val": 1}', f"{bucket}/table1/partK1=1/partK2=1/read_me.json")
-    helper.put_s3_file(b'{"val": 2}', f"{bucket}/table1/partK1=1/partK2=2/read_me_too.json")
-    helper.put_s3_file(b'{"val": 3}', f"{bucket}/table1/partK1=1/partK2=2/me_read_as_well.json")
-    helper.put_s3_file(b'{"val": 4}', f"{bucket}/table1/partK1=1/partK2=3/but_i_should_be_ignored.json")
-    helper.put_s3_file(b'{"val": 5}', f"{bucket}/table1/partK1=2/partK2=1/the_same_here.json")
-    helper.put_s3_file(b'{"val": 6}', f"{bucket}/table1/partK1=3/partK2=4/oh_and_this_read_too.json")
+    helper.put_s3_files(
+        {
+            f"{bucket}/table1/partK1=1/partK2=1/read_me.json": b'{"val": 1}',
+            f"{bucket}/table1/partK1=1/partK2=2/read_me_too.json": b'{"val": 2}',
+            f"{bucket}/table1/partK1=1/partK2=2/me_read_as_well.json": b'{"val": 3}',
+            f"{bucket}/table1/partK1=1/partK2=3/but_i_should_be_ignored.json": b'{"val": 4}',
+            f"{bucket}/table1/partK1=2/partK2=1/the_same_here.json": b'{"val": 5}',
+            f"{bucket}/table1/partK1=3/partK2=4/oh_and_this_read_too.json": b'{"val": 6}',
+        }
+    )
 
     def lt(partK2: str) -> bool:
         return int(partK2) <= 2
@@ -89,9 +93,13 @@ def test_fixed_column_format(helper):
     bucket = "test-bouquet"
     fs = helper.s3fs
     fs.mkdir(bucket)
-    helper.put_s3_file(b'{"val": 1}', f"{bucket}/table2/read_me/something/read_me.json")
-    helper.put_s3_file(b'{"val": 2}', f"{bucket}/table2/read_me/something_else/read_me_too.json")
-    helper.put_s3_file(b'{"val": 3}', f"{bucket}/table2/ignore_me/dont_care/about_this.json")
+    helper.put_s3_files(
+        {
+            f"{bucket}/table2/read_me/something/read_me.json": b'{"val": 1}',
+            f"{bucket}/table2/read_me/something_else/read_me_too.json": b'{"val": 2}',
+            f"{bucket}/table2/ignore_me/dont_care/about_this.json": b'{"val": 3}',
+        }
+    )
 
     def f(first_column: str) -> bool:
         return first_column == "read_me"
@@ -110,10 +118,14 @@ def test_partition_generation(helper):
     bucket = "test-bouquet"
     fs = helper.s3fs
     fs.mkdir(bucket)
-    helper.put_s3_file(b'{"val": 1}', f"{bucket}/table3/read_me/yes/i_will_be_there.json")
-    helper.put_s3_file(b'{"val": 2}', f"{bucket}/table3/read_me/indeed/i_will_too.json")
-    helper.put_s3_file(b'{"val": 3}', f"{bucket}/table3/read_me/no/i_will_not_be.json")
-    helper.put_s3_file(b'{"val": 4}', f"{bucket}/table3/ignore_me/for_real/like_really.json")
+    helper.put_s3_files(
+        {
+            f"{bucket}/table3/read_me/yes/i_will_be_there.json": b'{"val": 1}',
+            f"{bucket}/table3/read_me/indeed/i_will_too.json": b'{"val": 2}',
+            f"{bucket}/table3/read_me/no/i_will_not_be.json": b'{"val": 3}',
+            f"{bucket}/table3/ignore_me/for_real/like_really.json": b'{"val": 4}',
+        }
+    )
 
     parser = FixedColumnsParser.from_str("first_column=read_me/second_column=[yes,indeed]/fname")
     data = read_partitioned_table(f"s3://{bucket}/table3/", Q_TRUE, parser)
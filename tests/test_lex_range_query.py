@@ -42,8 +42,7 @@ def test_lex_range_query1(tmp_path):
     right_bad2 = tmp_path / "c1=e" / "c2=w" / "c3=c"
     for i, p in enumerate((left_bad1, left_bad2, included1, included2, included3, right_bad1, right_bad2)):
         p.mkdir(parents=True)
-        df = pd.DataFrame({"k": [i]})
-        df.to_csv(p / "f.csv", index=False)
+        (p / "f.csv").write_text(f"k\n{i}\n")
 
     query = LexRangeQuery(ranges=ranges)
     result_query = read_partitioned_table(f"file://{tmp_path}/", query)
@@ -73,8 +72,7 @@ def test_lex_range_query2(tmp_path):
     right_bad2 = tmp_path / "c1=101"
     for i, p in enumerate((left_bad1, included1, included2, included3, included4, right_bad1, right_bad2)):
         p.mkdir(parents=True)
-        df = pd.DataFrame({"k": [i]})
-        df.to_csv(p / "f.csv", index=False)
+        (p / "f.csv").write_text(f"k\n{i}\n")
 
     query = LexRangeQuery(ranges=ranges)
     result_query = read_partitioned_table(f"file://{tmp_path}/", query)
@@ -100,8 +98,7 @@ def test_combination(tmp_path):
 
     for i, p in enumerate((excluded1, included1, included2, excluded2, included3, excluded3)):
         p.mkdir(parents=True)
-        df = pd.DataFrame({"k": [i]})
-        df.to_csv(p / "f.csv", index=False)
+        (p / "f.csv").write_text(f"k\n{i}\n")
 
     result_query_or = read_partitioned_table(f"file://{tmp_path}/", or_q)
     result_query_or = result_query_or.sort_values(by=["k"]).reset_index(drop=True)
@@ -112,3 +109,13 @@ def test_combination(tmp_path):
 
     with pytest.raises(ValueError, match="No objects to concatenate"):  # TODO empty df would be nicer
         read_partitioned_table(f"file://{tmp_path}/", and_q)
+
+
+def test_lex_range_query_partial_columns():
+    """The memoized evaluation distinguishes the partial and the full evaluation of the same leading values."""
+    query = LexRangeQuery(ranges=[ColumnRange("c1", "b", "d"), ColumnRange("c2", "c", "d")])
+    assert query.eval_available({"c1": "b"})
+    assert not query.eval_all({"c1": "b"})
+    assert query.eval_all({"c1": "b", "c2": "c", "c3": "x"})
+    assert not query.eval_all({"c1": "b", "c2": "a"})
+    assert query.eval_available({"c1": "b"})
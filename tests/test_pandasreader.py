@@ -3,7 +3,7 @@ import pytest
 from pandas.testing import assert_frame_equal
 
 from fsql.api import read_partitioned_table
-from fsql.deser import InputFormat, PandasReader
+from fsql.deser import ArrowTableReader, InputFormat, PandasReader
 from fsql.query import Q_TRUE
 
 df1 = pd.DataFrame(data={"c1": [0, 1], "c2": ["hello", "world"]})
@@ -26,6 +26,19 @@ def test_input_format_override(tmp_path):
     assert_frame_equal(df1, succ_result)
 
 
+def test_json_default_dtypes(tmp_path):
+    """The default json read keeps pandas' own dtype inference, the pyarrow engine is opt-in."""
+    (tmp_path / "f.json").write_text('{"d": "2023-01-02", "n": "0012"}\n')
+
+    result = read_partitioned_table(f"file://{tmp_path}/", Q_TRUE)
+    assert result.d.dtype == object
+    assert result.n.to_list() == [12]
+
+    reader = PandasReader(input_format=InputFormat.JSON, engine="pyarrow")
+    result_pa = read_partitioned_table(f"file://{tmp_path}/", Q_TRUE, data_reader=reader)
+    assert result_pa.n.to_list() == ["0012"]
+
+
 def test_parquet_kwargs(tmp_path):
     """Test that a kwarg (`columns`) gets passed through and obeyed."""
 
@@ -47,10 +60,106 @@ def test_lazy_errors(tmp_path):
 
     error_line = "Following columns were requested but are not available: {'c3'}."
     with pytest.raises(ValueError, match=error_line):
-        reader_eager = PandasReader(columns=["c3"])
+        reader_eager = PandasReader(columns=["c3"], engine="fastparquet")
         result = read_partitioned_table(f"file://{case1_path}/", Q_TRUE, data_reader=reader_eager)
-    reader_lazy = PandasReader(columns=["c3"], lazy_errors=True)
+    reader_lazy = PandasReader(columns=["c3"], lazy_errors=True, engine="fastparquet")
     result = read_partitioned_table(f"file://{case1_path}/", Q_TRUE, data_reader=reader_lazy)
     assert_frame_equal(df2[["c3"]], result.data)
     reasons = [e.reason.split("\n")[0] for e in result.failures]
     assert reasons == [error_line]
+
+
+def test_arrow_concat(tmp_path):
+    """Parquet partitions concatenated on the arrow side give the same frame, up to the index."""
+    for part, df in (("0", df1), ("1", df2)):
+        (tmp_path / f"p={part}").mkdir()
+        df.to_parquet(tmp_path / f"p={part}" / "f.parquet", index=False)
+
+    expected = pd.concat([df1.assign(p="0"), df2.assign(p="1")])
+    result = read_partitioned_table(f"file://{tmp_path}/", Q_TRUE, data_reader=PandasReader(arrow_concat=True))
+    assert_frame_equal(expected.reset_index(drop=True), result)
+
+
+def test_arrow_concat_mixed_formats(tmp_path):
+    """Partitions of other formats keep their position among the parquet ones, the index is fresh."""
+    for part, df in (("0", df1), ("1", df2), ("2", df1)):
+        (tmp_path / f"p={part}").mkdir()
+        df.to_parquet(tmp_path / f"p={part}" / "f.parquet", index=False)
+    (tmp_path / "p=1" / "f.parquet").unlink()
+    df2.to_json(tmp_path / "p=1" / "f.json", orient="records", lines=True)
+
+    expected = pd.concat([df1.assign(p="0"), df2.assign(p="1"), df1.assign(p="2")], ignore_index=True)
+    result = read_partitioned_table(f"file://{tmp_path}/", Q_TRUE, data_reader=PandasReader(arrow_concat=True))
+    assert_frame_equal(expected, result)
+
+    with pytest.raises(ValueError, match="arrow_concat requires the pyarrow engine"):
+        PandasReader(arrow_concat=True, engine="fastparquet")
+
+
+def test_cpu_parallelism_processes(tmp_path):
+    """Reading in a process pool gives the same result as in threads."""
+    for part, df in (("0", df1), ("1", df2)):
+        (tmp_path / f"p={part}").mkdir()
+        df.to_parquet(tmp_path / f"p={part}" / "f.parquet", index=False)
+
+    expected = read_partitioned_table(f"file://{tmp_path}/", Q_TRUE)
+    reader = PandasReader(cpu_parallelism="processes")
+    result = read_partitioned_table(f"file://{tmp_path}/", Q_TRUE, data_reader=reader)
+    assert_frame_equal(expected, result)
+
+
+def test_parquet_pushdown(tmp_path):
+    """The `columns` may include partition columns, the `filters` drop rows already in the parquet read."""
+    for part, df in (("0", df1), ("1", df2)):
+        (tmp_path / f"p={part}").mkdir()
+        df.to_parquet(tmp_path / f"p={part}" / "f.parquet", index=False)
+    df2.to_json(tmp_path / "p=1" / "f.json", orient="records", lines=True)
+
+    reader = PandasReader(columns=["c2", "p"], filters=[("c1", ">", 0)])
+    result = read_partitioned_table(f"file://{tmp_path}/", Q_TRUE, data_reader=reader)
+    expected = pd.concat(
+        [
+            df1[["c2"]].assign(p="0").iloc[1:].reset_index(drop=True),
+            df2.assign(p="1"),  # json ignores the pushdown
+            df2[["c2"]].assign(p="1"),
+        ]
+    )
+    assert_frame_equal(expected, result)
+
+
+def test_csv_columns(tmp_path):
+    """The `columns` select csv columns as well, partition columns included."""
+    for part, df in (("0", df1), ("1", df2)):
+        (tmp_path / f"p={part}").mkdir()
+        df.to_csv(tmp_path / f"p={part}" / "f.csv", index=False)
+
+    reader = PandasReader(columns=["c3", "c1", "p"])
+    result = read_partitioned_table(f"file://{tmp_path}/", Q_TRUE, data_reader=reader)
+    expected = pd.concat([df1[["c1"]].assign(p="0"), df2[["c1", "c3"]].assign(p="1")])
+    assert_frame_equal(expected, result)
+
+
+def test_partition_columns_only(tmp_path):
+    """With only partition columns selected, the row count is the same for csv as for parquet."""
+    for part, df in (("0", df1), ("1", df2)):
+        (tmp_path / f"p={part}").mkdir()
+    df1.to_csv(tmp_path / "p=0" / "f.csv", index=False)
+    df2.to_parquet(tmp_path / "p=1" / "f.parquet", index=False)
+
+    reader = PandasReader(columns=["p"])
+    result = read_partitioned_table(f"file://{tmp_path}/", Q_TRUE, data_reader=reader)
+    assert result.p.to_list() == ["0", "0", "1", "1"]
+    assert list(result.columns) == ["p"]
+
+
+def test_arrow_table_reader(tmp_path):
+    """The pyarrow Table is returned as is, mixing in the non-parquet partitions."""
+    for part, df in (("0", df1), ("1", df2)):
+        (tmp_path / f"p={part}").mkdir()
+        df.to_parquet(tmp_path / f"p={part}" / "f.parquet", index=False)
+    df1.to_csv(tmp_path / "p=1" / "g.csv", index=False)
+
+    result = read_partitioned_table(f"file://{tmp_path}/", Q_TRUE, data_reader=ArrowTableReader())
+    assert result.num_rows == 6
+    expected = pd.concat([df1.assign(p="0"), df2.assign(p="1"), df1.assign(p="1")])
+    assert_frame_equal(expected.reset_index(drop=True), result.to_pandas())
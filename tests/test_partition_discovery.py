@@ -0,0 +1,125 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import fsspec
+
+from fsql.api import read_partitioned_table
+from fsql.column_parser import AUTO_PARSER, AutoParser, FixedColumnsParser
+from fsql.deser import PandasReader, _shared_thread_pool
+from fsql.partition import Partition
+from fsql.partition_discovery import discover_partitions, list_directory, list_tree
+from fsql.query import Q_EQ, Q_TRUE
+
+
+def test_discovery_executor(tmp_path):
+    """Validates that concurrent listing of sibling directories does not change the result nor its order."""
+    for c1 in ("1", "2", "3"):
+        for c2 in ("a", "b"):
+            p = tmp_path / f"c1={c1}" / f"c2={c2}"
+            p.mkdir(parents=True)
+            (p / "f1.csv").write_text("k\n1\n")
+            (p / "f2.csv").write_text("k\n2\n")
+    fs = fsspec.filesystem("file")
+    query = Q_EQ("c2", "b")
+
+    sequential = list(discover_partitions(query, AUTO_PARSER, Partition(f"{tmp_path}/", {}), fs))
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        concurrent = list(discover_partitions(query, AUTO_PARSER, Partition(f"{tmp_path}/", {}), fs, executor))
+
+    assert sequential == concurrent
+    assert [(p.columns["c1"], p.url.split("/")[-1]) for p in concurrent] == [
+        ("1", "f1.csv"),
+        ("1", "f2.csv"),
+        ("2", "f1.csv"),
+        ("2", "f2.csv"),
+        ("3", "f1.csv"),
+        ("3", "f2.csv"),
+    ]
+
+
+def test_list_tree(tmp_path):
+    """Validates that the bulk listing agrees with the directory-by-directory one."""
+    for path in ("c1=1/c2=a", "c1=1/c2=b", "c1=2/c2=a", "c1=3"):
+        (tmp_path / path).mkdir(parents=True)
+    for path in ("c1=1/c2=a/f1.csv", "c1=1/c2=a/f2.csv", "c1=1/c2=b/f1.csv", "c1=2/c2=a/f1.csv", "f0.csv"):
+        (tmp_path / path).write_text("k\n1\n")
+    if hasattr(os, "mkfifo"):
+        os.mkfifo(tmp_path / "c1=2/c2=a/pipe")  # neither a file nor a directory, skipped by both listings
+    fs = fsspec.filesystem("file")
+
+    tree = list_tree(f"{tmp_path}/", fs)
+    for directory in ("", "c1=1", "c1=1/c2=a", "c1=1/c2=b", "c1=2", "c1=2/c2=a"):
+        url = f"{tmp_path}/{directory}".rstrip("/")
+        assert tree[fs._strip_protocol(url)] == list_directory(url, fs)
+    assert fs._strip_protocol(f"{tmp_path}/c1=3") not in tree  # empty directories have no listing of their own
+
+    assert AutoParser.from_str("c1/c2").known_depth() == 3
+    assert FixedColumnsParser.from_str("c1/c2/fname").known_depth() == 3
+    assert AutoParser.from_str("c1=[1,2]/c2").known_depth() is None
+    assert AUTO_PARSER.known_depth() is None
+    parser = AutoParser.from_str("c1/c2")
+    bulk = list(discover_partitions(Q_EQ("c2", "a"), parser, Partition(f"{tmp_path}/", {}), fs))
+    assert [p.url[len(str(tmp_path)) :] for p in bulk] == [
+        "/c1=1/c2=a/f1.csv",
+        "/c1=1/c2=a/f2.csv",
+        "/c1=2/c2=a/f1.csv",
+    ]
+
+
+def test_list_tree_not_used_with_prescribing_query(tmp_path):
+    """A query prescribing values of a column makes discovery walk only the prescribed subtrees, not find all."""
+    for c1 in ("1", "2", "3"):
+        for c2 in ("a", "b"):
+            p = tmp_path / f"c1={c1}" / f"c2={c2}"
+            p.mkdir(parents=True)
+            (p / "f.csv").write_text("k\n1\n")
+    fs = fsspec.filesystem("file")
+    parser = AutoParser.from_str("c1/c2")
+    query = Q_EQ("c1", "2")
+    assert parser.known_depth() == 3
+    assert parser.known_depth(query) is None
+
+    with patch.object(fs, "find", wraps=fs.find) as find, patch.object(fs, "ls", wraps=fs.ls) as ls:
+        result = list(discover_partitions(query, parser, Partition(f"{tmp_path}/", {}), fs))
+    assert find.call_count == 0
+    listed = {call.args[0].rstrip("/")[len(str(tmp_path)) :] for call in ls.call_args_list}
+    assert listed == {"/c1=2", "/c1=2/c2=a", "/c1=2/c2=b"}
+    assert [p.url[len(str(tmp_path)) :] for p in result] == ["/c1=2/c2=a/f.csv", "/c1=2/c2=b/f.csv"]
+
+
+def test_discovery_pool_shared(tmp_path):
+    """Without an explicit `concurrency`, no pool is created per call."""
+    (tmp_path / "c1=1").mkdir()
+    (tmp_path / "c1=1" / "f.csv").write_text("k\n1\n")
+    with patch("fsql.api.ThreadPoolExecutor") as pool:
+        result = read_partitioned_table(f"file://{tmp_path}/", Q_TRUE)
+    assert not pool.called
+    assert result.k.to_list() == [1]
+
+
+def test_nested_calls_on_shared_pools(tmp_path):
+    """A reader which reads another table within `read_single` must not deadlock the single-worker shared pools."""
+    for table in ["outer", "inner"]:
+        for c1 in ["1", "2"]:
+            (tmp_path / table / f"c1={c1}").mkdir(parents=True)
+            (tmp_path / table / f"c1={c1}" / "f.csv").write_text(f"k\n{c1}\n")
+
+    class NestedReader(PandasReader):
+        def read_single(self, partition, fs):
+            inner = read_partitioned_table(f"file://{tmp_path}/inner/", Q_TRUE)
+            (df,), failures = super().read_single(partition, fs)
+            df["inner"] = inner.k.sum()
+            return [df], failures
+
+    io_pool, local_io_pool, discovery_pool = (_shared_thread_pool(1, name) for name in ["io", "local-io", "discovery"])
+    # a deadlock would hang the `with` exit of an executor, thus the outer call is waited for with a timeout only
+    caller = ThreadPoolExecutor(max_workers=1)
+    with patch.multiple("fsql.deser", _IO_POOL=io_pool, _LOCAL_IO_POOL=local_io_pool), patch(
+        "fsql.api._DISCOVERY_POOL", discovery_pool
+    ):
+        future = caller.submit(read_partitioned_table, f"file://{tmp_path}/outer/", Q_TRUE, data_reader=NestedReader())
+        result = future.result(timeout=60)
+    caller.shutdown()
+    assert result.k.to_list() == [1, 2]
+    assert result.inner.to_list() == [3, 3]
@@ -0,0 +1,31 @@
+import pandas as pd
+import pytest
+
+from fsql.api import read_partitioned_table
+from fsql.query import Q_TRUE
+
+pl = pytest.importorskip("polars")
+
+df1 = pd.DataFrame(data={"c1": [0, 1], "c2": ["hello", "world"]})
+df2 = pd.DataFrame(data={"c1": [2, 3], "c2": ["salve", "mundi"], "c3": [0.1, 0.2]})
+
+
+def test_polars_reader(tmp_path):
+    """The PolarsReader is a drop-in replacement of the PandasReader, giving a Polars DataFrame instead."""
+    from fsql.deser_polars import PolarsReader
+
+    for part, df in (("0", df1), ("1", df2)):
+        (tmp_path / f"p={part}").mkdir()
+        df.to_parquet(tmp_path / f"p={part}" / "f.parquet", index=False)
+    df1.to_csv(tmp_path / "p=1" / "g.csv", index=False)
+
+    result = read_partitioned_table(f"file://{tmp_path}/", Q_TRUE, data_reader=PolarsReader())
+    expected = pl.concat(
+        [
+            pl.from_pandas(df1.assign(p="0")),
+            pl.from_pandas(df2.assign(p="1")),
+            pl.from_pandas(df1.assign(p="1")),
+        ],
+        how="diagonal_relaxed",
+    )
+    assert result.sort("p", "c1").equals(expected.sort("p", "c1").select(result.columns))
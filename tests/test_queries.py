@@ -1,10 +1,13 @@
 from pathlib import Path
+from unittest.mock import patch
 
+import fsspec
 import pandas as pd
 from pandas.testing import assert_frame_equal
 
 from fsql.api import read_partitioned_table
-from fsql.query import Q_IN, Q_OR
+from fsql.column_parser import AutoParser
+from fsql.query import Q_AND, Q_EQ, Q_IN, Q_OR, AllQuery, AnyQuery, AtomicQuery, EqQuery
 
 
 def make_test_dfs():
@@ -41,3 +44,78 @@ def test_q_in_multiple(tmp_path):
     result = read_partitioned_table(f"file://{data_path}/", Q_OR(Q_IN("part", ["0"]), Q_IN("part", ["1"])))
     expected = pd.concat([df0.assign(part="0"), df1.assign(part="1")])
     assert_frame_equal(result, expected)
+
+
+def test_query_pushdown(tmp_path):
+    """When the parser knows the column order, values prescribed by the query are used instead of listing."""
+    data_path = tmp_path / "data_pushdown"
+    df0, df1, df2 = make_test_dfs()
+    df0.to_csv(make_path(data_path / "part=0" / "sub=x") / "f.csv", index=False)
+    df1.to_csv(make_path(data_path / "part=1" / "sub=x") / "f.csv", index=False)
+    df2.to_csv(make_path(data_path / "part=2" / "sub=y") / "f.csv", index=False)
+
+    fs = fsspec.filesystem("file")
+    parser = AutoParser.from_str("part/sub=[x,y]")
+    query = Q_AND(Q_IN("part", ["7", "2", "1"]), Q_OR(Q_EQ("sub", "x"), Q_EQ("sub", "y")))
+    with patch.object(fs, "ls", wraps=fs.ls) as ls:
+        result = read_partitioned_table(f"file://{data_path}/", query, parser, fs=fs)
+    listed = {call.args[0].rstrip("/").split(str(data_path))[-1] for call in ls.call_args_list}
+    assert "" not in listed  # the root is not listed, the query prescribes its subdirectories
+    assert "/part=7" in listed  # nonexistent prescribed partitions are skipped
+    expected = pd.concat([df1.assign(part="1", sub="x"), df2.assign(part="2", sub="y")])
+    assert_frame_equal(result, expected)
+
+
+def test_atomic_query_memoized():
+    """The query function is evaluated once per distinct values of its own columns."""
+    calls = []
+
+    def f(c2):
+        calls.append(c2)
+        return c2 == "b"
+
+    query = AtomicQuery(f)
+    results = [query.eval_available({"c1": c1, "c2": c2}) for c1 in ("1", "2", "3") for c2 in ("a", "b")]
+    assert results == [False, True] * 3
+    assert query.eval_all({"c1": "4", "c2": "b"})
+    assert calls == ["a", "b"]
+
+
+def test_eq_query():
+    """The specialised Q_EQ keeps the AtomicQuery semantics for missing columns."""
+    query = Q_EQ("c1", "4")
+    assert isinstance(query, AtomicQuery)
+    assert query.eval_available({"c2": "x"})
+    assert not query.eval_all({"c2": "x"})
+    assert query.eval_all({"c1": "4", "c2": "x"})
+    assert not query.eval_available({"c1": "5"})
+    assert query.generate("c1") == ["4"]
+
+
+def test_boolean_short_circuit():
+    """The right side of Q_AND / Q_OR is not evaluated once the left side decides."""
+    calls = []
+
+    def f(c2):
+        calls.append(c2)
+        return True
+
+    assert not Q_AND(Q_EQ("c1", "x"), AtomicQuery(f)).eval_all({"c1": "y", "c2": "a"})
+    assert Q_OR(Q_EQ("c1", "y"), AtomicQuery(f)).eval_available({"c1": "y", "c2": "a"})
+    assert calls == []
+    assert Q_AND(Q_EQ("c1", "y"), AtomicQuery(f)).eval_all({"c1": "y", "c2": "a"})
+    assert calls == ["a"]
+
+
+def test_query_optimize():
+    """The nested conjunctions are flattened and the cheapest conjuncts go first, without changing the result."""
+    expensive = AtomicQuery(lambda c2: c2 == "a")
+    query = Q_AND(expensive, Q_AND(Q_OR(Q_EQ("c1", "x"), expensive), Q_EQ("c3", "z")))
+    optimized = query.optimize()
+    assert isinstance(optimized, AllQuery)
+    assert [type(operand) for operand in optimized.operands] == [EqQuery, AtomicQuery, AnyQuery]
+    for columns in ({"c1": "x", "c2": "a", "c3": "z"}, {"c1": "y", "c2": "a", "c3": "z"}, {"c1": "x", "c2": "b"}):
+        assert query.eval_all(columns) == optimized.eval_all(columns)
+        assert query.eval_available(columns) == optimized.eval_available(columns)
+    assert optimized.generate("c3") == ["z"]
+    assert Q_OR(Q_EQ("c1", "x"), Q_IN("c1", ["y", "x"])).optimize().generate("c1") == ["x", "y"]
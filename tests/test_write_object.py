@@ -2,6 +2,7 @@ import io
 import json
 
 import pandas as pd
+import pyarrow.parquet as pq
 import pytest
 from pandas.testing import assert_frame_equal
 
@@ -66,6 +67,15 @@ def test_format_engine_option(tmpdir):
     assert_frame_equal(df, df2)
 
 
+def test_format_compression_option(tmpdir):
+    df = pd.DataFrame({"a": [1, 2]})
+    for engine in ("pyarrow", "fastparquet"):
+        path = tmpdir.join(f"{engine}.parquet")
+        write_object(f"file://{path}", df, "parquet", {"engine": engine, "compression": "zstd"})
+        assert pq.ParquetFile(path).metadata.row_group(0).column(0).compression == "ZSTD"
+        assert_frame_equal(df, pd.read_parquet(path, engine=engine))
+
+
 def test_wrong_formats():
     df = pd.DataFrame({"a": [1, 2]})
     with pytest.raises(ValueError):